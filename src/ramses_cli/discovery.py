@@ -41,6 +41,11 @@ SCAN_FULL: Final = "scan_full"
 SCAN_HARD: Final = "scan_hard"
 SCAN_XXXX: Final = "scan_xxxx"
 
+# The codes/IDs iterated over by the scan scripts (module-level, so tests can trim them)
+_SCAN_FULL_CODES: tuple[Code, ...] = tuple(sorted(CODES_SCHEMA))
+_SCAN_HARD_END: int = 0x5000  # exclusive upper bound; start_code is the lower one
+_SCAN_OTB_HARD_RANGE: range = range(0x80)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -302,7 +307,7 @@ async def script_scan_full(gwy: Gateway, dev_id: DeviceIdT) -> None:
         num_repeats=3,
     )
 
-    for code in sorted(CODES_SCHEMA):
+    for code in _SCAN_FULL_CODES:
         if code == Code._0005:
             for zone_type in range(20):  # known up to 18
                 gwy.send_cmd(
@@ -480,7 +485,7 @@ async def script_scan_hard(
 
     start_code = start_code or 0
 
-    for code in range(start_code, 0x5000):
+    for code in range(start_code, _SCAN_HARD_END):
         await gwy.async_send_cmd(
             (
                 CommandDTO(
@@ -596,7 +601,7 @@ async def script_scan_otb_hard(gwy: Gateway, dev_id: DeviceIdT) -> None:
     """
     _LOGGER.warning("script_scan_otb_hard invoked - expect a lot of nonsense")
 
-    for msg_id in range(0x80):
+    for msg_id in _SCAN_OTB_HARD_RANGE:
         cmd = build_dto(
             Intent(
                 src=HGI_DEV_ADDR,
@@ -6,6 +6,8 @@ from __future__ import annotations
 # TODO:
 # - fix dispatching - what devices (some are Addr) are sent packets, esp. 1FC9s
 import logging
+import time
+from collections import OrderedDict
 from datetime import timedelta as td
 from typing import TYPE_CHECKING, Final
 
@@ -63,6 +65,37 @@ MSG_FORMAT_18 = "|| {:18s} | {:18s} | {:2s} | {:16s} | {:^4s} || {}"
 
 _TD_SECONDS_003 = td(seconds=3)
 
+# Safe-mode tracebacks are emitted at most once per error signature per period
+_TRACEBACK_PERIOD: Final[float] = 60.0
+_TRACEBACK_MAX_SIGS: Final[int] = 256
+_traceback_last_seen: OrderedDict[tuple[type[Exception], str, str], float] = (
+    OrderedDict()
+)  # least recently logged first
+
+
+def _want_traceback(err: Exception, msg: Message) -> bool:
+    """Return True if a traceback for this error signature is due.
+
+    :param err: The exception raised whilst processing the message.
+    :type err: Exception
+    :param msg: The Message being processed.
+    :type msg: Message
+    :return: True if the signature was not seen within the rate-limit period.
+    :rtype: bool
+    """
+    sig = (err.__class__, str(err), str(msg.code))
+    now = time.monotonic()
+
+    last_seen = _traceback_last_seen.get(sig)
+    if last_seen is not None and now - last_seen < _TRACEBACK_PERIOD:
+        return False
+
+    _traceback_last_seen[sig] = now
+    _traceback_last_seen.move_to_end(sig)
+    while len(_traceback_last_seen) > _TRACEBACK_MAX_SIGS:
+        _traceback_last_seen.popitem(last=False)  # evict the stalest signature
+    return True
+
 
 def _log_message(gwy: Gateway, msg: Message) -> None:
     """Log msg according to src, code, log.debug setting.
@@ -125,7 +158,13 @@ async def process_msg(gwy: Gateway, msg: Message) -> None:
     except (AttributeError, LookupError, TypeError, ValueError) as err:
         if getattr(gwy.config, "enforce_strict_handling", False):
             raise
-        _LOGGER.warning("%s < %s(%s)", msg, err.__class__.__name__, err, exc_info=True)
+        _LOGGER.warning(
+            "%s < %s(%s)",
+            msg,
+            err.__class__.__name__,
+            err,
+            exc_info=_want_traceback(err, msg),
+        )
 
     else:
         _log_message(gwy, msg)
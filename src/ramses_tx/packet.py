@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import contextlib
 import logging
+import sys
 from datetime import datetime as dt, timedelta as td
 from typing import Any
 
@@ -238,12 +239,14 @@ class Packet:
                 f"Bad frame: Insufficient fields: >>>{raw_line_body}<<<"
             )
 
-        verb = raw_line_body[:2]
+        # verb & code come from small, fixed vocabularies and are used as dict
+        # keys downstream (StateHeader, message indexes), so share one object each
+        verb = sys.intern(raw_line_body[:2])
         seqn = fields[1]
         addr1 = fields[2]
         addr2 = fields[3]
         addr3 = fields[4]
-        code = fields[5]
+        code = sys.intern(fields[5])
         len_ = fields[6]
         payload = fields[7]
 
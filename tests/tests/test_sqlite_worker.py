@@ -11,6 +11,7 @@ from pathlib import Path
 import pytest
 
 from ramses_rf.messages import Message
+from ramses_rf.sqlite_worker import SQLiteWorker
 from ramses_rf.state import MessageStore
 from ramses_tx.packet import Packet
 
@@ -239,3 +240,21 @@ async def test_storage_worker_delete(tmp_path: Path) -> None:
     finally:
         if pytest_env is not None:
             os.environ["PYTEST_CURRENT_TEST"] = pytest_env
+
+
+def test_storage_worker_file_db_uses_wal(tmp_path: Path) -> None:
+    """Verify that a file-backed StorageWorker database is in WAL mode."""
+    db_path = tmp_path / "test_wal.sqlite"
+
+    worker = SQLiteWorker(str(db_path), disk_path=None)
+    try:
+        assert worker.wait_for_ready(timeout=5.0)
+
+        # WAL is persistent, so a second connection must see it too
+        conn = sqlite3.connect(str(db_path))
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+    finally:
+        worker.stop()
+
+    assert journal_mode == "wal"
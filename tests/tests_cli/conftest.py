@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Fixtures for testing the ramses_cli package."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from asyncclick.testing import CliRunner
+
+from ramses_rf.gateway import Gateway
+
+
+@pytest.fixture(scope="session")
+def gateway_template() -> MagicMock:
+    """Build the spec'd Gateway mock once per session.
+
+    MagicMock(spec=Gateway) introspects the Gateway class, so the test
+    modules build their own (module-scoped) templates on top of this one
+    and then copy.deepcopy() it per test. A shallow copy is not enough, as
+    it would share the child mocks (and their call state) between tests.
+    """
+    gateway = MagicMock(spec=Gateway)
+    # Explicitly assign a MagicMock to __str__, as the spec'd mock has none
+    gateway.__str__ = MagicMock(return_value="Gateway")  # type: ignore[method-assign]
+
+    # IMPORTANT: Configure config so scripts don't return early
+    gateway.config = MagicMock(
+        disable_discovery=False,
+        enable_eavesdrop=False,
+        # Provide a dictionary for known_list so json.dumps doesn't crash on MagicMock
+        known_list={"18:123456": {"class": "HGI"}},
+    )
+
+    return gateway
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """Share a single CliRunner across all CLI tests."""
+    return CliRunner()
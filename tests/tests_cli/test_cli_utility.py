@@ -113,6 +113,7 @@ def id_fnc(param: int) -> str:
 @pytest.mark.parametrize("index", range(len(BASIC_TESTS)), ids=id_fnc)
 async def test_client_basic(
     monkeypatch: pytest.MonkeyPatch,
+    runner: CliRunner,
     index: int,
     tests: tuple[
         tuple[
@@ -133,8 +134,6 @@ async def test_client_basic(
         tuple[list[str], dict[str, int | None], dict[str, Collection[str]]],
     ] = BASIC_TESTS,
 ) -> None:
-    runner = CliRunner()
-
     # Strip the script name ('client.py') from the arguments array before passing it to the runner
     args = tests[index][0][1:]
 
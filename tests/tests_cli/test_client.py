@@ -2,17 +2,21 @@
 """Unittests for the ramses_cli client.py class."""
 
 import asyncio
+import copy
 import io
 import json
-from collections.abc import AsyncGenerator, Awaitable, Callable
+import os
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
 from datetime import datetime as dt
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, mock_open, patch
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 
 import asyncclick as click
 import pytest
 from asyncclick.testing import CliRunner
 
+from ramses_cli import client as client_module
 from ramses_cli.client import (
     EXECUTE,
     LISTEN,
@@ -40,34 +44,99 @@ from ramses_tx import exceptions as exc
 from ramses_tx.const import I_, Code
 from ramses_tx.schemas import SZ_PACKET_LOG, SZ_SERIAL_PORT
 
-STDIN = io.StringIO("053  I --- 01:123456 --:------ 01:123456 3150 002 FC00\r\n")
+STDIN = "053  I --- 01:123456 --:------ 01:123456 3150 002 FC00\r\n"
 CMD = "RQ 01:123456 1F09 00"
 
+# handle_msg only formats the dtm, so a fixed value avoids a clock read per test
+_FIXED_DTM = dt(2024, 1, 1)
+
+_RESTORE_STATE: dict[str, Any] = {
+    "data": {"client_state": {"schema": {}, "packets": []}}
+}
+_RESTORE_PAYLOAD = json.dumps(_RESTORE_STATE)
 
-@pytest.fixture
-async def mock_gateway() -> AsyncGenerator[MagicMock, None]:
-    """Create a mock Gateway instance for testing."""
-    gateway = MagicMock(spec=Gateway)
-    # Fix: Explicitly assign a MagicMock to __str__ and tell mypy to ignore the method assignment
-    gateway.__str__ = MagicMock(return_value="Gateway")  # type: ignore[method-assign]
-
-    gateway.send_cmd = AsyncMock()
-    gateway.dispatcher = MagicMock()
-    gateway.dispatcher.send = MagicMock()
-    gateway.start = AsyncMock()
-    gateway.stop = AsyncMock()
-    gateway.get_state = AsyncMock(return_value=({}, {}))
-    gateway._restore_cached_packets = AsyncMock()
-    gateway.add_msg_handler = MagicMock()
+
+@pytest.fixture(scope="module")
+def client_gateway_template(gateway_template: MagicMock) -> MagicMock:
+    """Build the static parts of the client's mock Gateway once per module."""
+    gateway = copy.deepcopy(gateway_template)
 
     # Fix: Create the nested engine structure
-    gateway._engine = MagicMock()
+    engine = MagicMock(
+        # Fix: Explicitly mock the private protocol attribute inside the engine
+        # Fix: Explicitly mock wait_for_connection_lost as an async method
+        _protocol=MagicMock(wait_for_connection_lost=AsyncMock()),
+        # Fix: Mock the loop inside the engine
+        _loop=MagicMock(
+            call_soon=MagicMock(),
+            call_later=MagicMock(),
+            time=MagicMock(return_value=0.0),
+        ),
+        _include={},
+    )
 
-    # Fix: Explicitly mock the private protocol attribute inside the engine
-    gateway._engine._protocol = MagicMock()
+    # Mock devices for print_summary
+    mock_dev = MagicMock(
+        id="01:123456",
+        type=DEV_TYPE_MAP.CTL,  # Controller
+        # These are now async methods
+        schema=AsyncMock(return_value={"mock": "schema"}),
+        params=AsyncMock(return_value={"mock": "params"}),
+        status=AsyncMock(return_value={"mock": "status"}),
+        traits=AsyncMock(return_value={"mock": "traits"}),
+        # Mock message database interaction via the entity_state component
+        entity_state=MagicMock(
+            get_state_cache_nested=AsyncMock(
+                return_value={
+                    Code._0005: {"verb": {"pkt": "msg_0005"}},
+                    Code._000C: {"verb": {"pkt": "msg_000C"}},
+                }
+            )
+        ),
+    )
+
+    # Mock system_by_id for print_results
+    mock_sys = MagicMock(
+        zone_by_idx={"01": MagicMock(schedule=[{"day": "Tuesday"}])},
+    )
+    mock_sys.configure_mock(
+        **{
+            "dhw.schedule": [{"day": "Monday"}],
+            # Fix: Use integer key for faultlog to match expectations of print_results
+            "_faultlog.faultlog": {0: "fault_data"},
+        }
+    )
+
+    gateway.configure_mock(
+        **{
+            "send_cmd": AsyncMock(),
+            "dispatcher": MagicMock(send=MagicMock()),
+            "start": AsyncMock(),
+            "stop": AsyncMock(),
+            "get_state": AsyncMock(return_value=({}, {})),
+            "_restore_cached_packets": AsyncMock(),
+            "add_msg_handler": MagicMock(),
+            "_engine": engine,
+            "device_registry.devices": [mock_dev],
+            "device_registry.system_by_id": {"01:123456": mock_sys},
+            "tcs": None,  # mimic no TCS
+            "schema": AsyncMock(return_value={"global": "schema"}),
+            "params": AsyncMock(return_value={"global": "params"}),
+            "status": AsyncMock(return_value={"global": "status"}),
+            # Stub the message store; no test here queries a real SQLite index
+            "message_store": MagicMock(spec=MessageStore),
+        }
+    )
 
-    # Fix: Explicitly mock wait_for_connection_lost as an async method
-    gateway._engine._protocol.wait_for_connection_lost = AsyncMock()
+    return gateway
+
+
+@pytest.fixture
+async def mock_gateway(
+    client_gateway_template: MagicMock,
+) -> AsyncGenerator[MagicMock, None]:
+    """Create a mock Gateway instance for testing."""
+    gateway = copy.deepcopy(client_gateway_template)
 
     # Fix: Create a future attached to the running loop.
     loop = asyncio.get_running_loop()
@@ -76,59 +145,43 @@ async def mock_gateway() -> AsyncGenerator[MagicMock, None]:
     future.set_result(None)
     gateway._engine._protocol._wait_connection_lost = future
 
-    # Add required attributes
-    gateway.config = MagicMock()
-    gateway.config.disable_discovery = False
-    gateway.config.enable_eavesdrop = False
+    yield gateway
 
-    # Fix: Provide a dictionary for known_list so json.dumps doesn't crash on MagicMock
-    gateway.config.known_list = {"18:123456": {"class": "HGI"}}
 
-    # Fix: Mock the loop inside the engine
-    gateway._engine._loop = MagicMock()
-    gateway._engine._loop.call_soon = MagicMock()
-    gateway._engine._loop.call_later = MagicMock()
-    gateway._engine._loop.time = MagicMock(return_value=0.0)
-    gateway._engine._include = {}
+@pytest.fixture
+def patched_client(mock_gateway: MagicMock) -> Generator[SimpleNamespace, None, None]:
+    """Patch the client's Gateway, normalise_config and spawn_scripts.
 
-    # Mock devices for print_summary
-    mock_dev = MagicMock()
-    mock_dev.id = "01:123456"
-    mock_dev.type = DEV_TYPE_MAP.CTL  # Controller
-
-    # These are now async methods
-    mock_dev.schema = AsyncMock(return_value={"mock": "schema"})
-    mock_dev.params = AsyncMock(return_value={"mock": "params"})
-    mock_dev.status = AsyncMock(return_value={"mock": "status"})
-    mock_dev.traits = AsyncMock(return_value={"mock": "traits"})
-
-    # Mock message database interaction via the entity_state component
-    mock_dev.entity_state = MagicMock()
-    mock_dev.entity_state.get_state_cache_nested = AsyncMock(
-        return_value={
-            Code._0005: {"verb": {"pkt": "msg_0005"}},
-            Code._000C: {"verb": {"pkt": "msg_000C"}},
-        }
+    The targets are patched in one patch.multiple() on the already-imported
+    module object, so the dotted-path lookup of patch() is avoided.
+    """
+    mocks = SimpleNamespace(
+        Gateway=MagicMock(return_value=mock_gateway),
+        normalise_config=MagicMock(side_effect=lambda lib_kwargs: (None, lib_kwargs)),
+        spawn_scripts=MagicMock(return_value=[]),
     )
+    with patch.multiple(client_module, **vars(mocks)):
+        yield mocks
 
-    gateway.device_registry.devices = [mock_dev]
-    gateway.tcs = None  # mimic no TCS
-    gateway.schema = AsyncMock(return_value={"global": "schema"})
-    gateway.params = AsyncMock(return_value={"global": "params"})
-    gateway.status = AsyncMock(return_value={"global": "status"})
 
-    # Add msg_db attribute
-    gateway.message_store = MessageStore(maintain=False)
+@pytest.fixture(scope="session")
+def config_file(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Write a CLI configuration file once per session."""
+    path = tmp_path_factory.mktemp("cli") / "test_config.json"
+    path.write_text(json.dumps({"config": {"disable_discovery": True}}))
+    return str(path)
 
-    # Mock system_by_id for print_results
-    mock_sys = MagicMock()
-    mock_sys.dhw.schedule = [{"day": "Monday"}]
-    mock_sys.zone_by_idx = {"01": MagicMock(schedule=[{"day": "Tuesday"}])}
-    # Fix: Use integer key for faultlog to match expectations of print_results
-    mock_sys._faultlog.faultlog = {0: "fault_data"}
-    gateway.device_registry.system_by_id = {"01:123456": mock_sys}
 
-    yield gateway
+@pytest.fixture
+def printed(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Collect the lines printed by ramses_cli.client, without capsys."""
+    sink: list[str] = []
+
+    def fake_print(*args: Any, **kwargs: Any) -> None:
+        sink.append(" ".join(map(str, args)))
+
+    monkeypatch.setattr("ramses_cli.client.print", fake_print, raising=False)
+    return sink
 
 
 # --- CLI Argument Parsing Tests ---
@@ -136,41 +189,51 @@ async def mock_gateway() -> AsyncGenerator[MagicMock, None]:
 
 @pytest.mark.asyncio
 async def test_parse_no_input() -> None:
-    runner = CliRunner()
-    result = await runner.invoke(cli, ["parse"])
-    assert result.exit_code == 2  # missing input file
-    assert result.output.startswith("Usage: cli parse [OPTIONS] INPUT_FILE")
+    with pytest.raises(click.UsageError) as exc_info:
+        await cli.commands["parse"].main(
+            [], prog_name="cli parse", standalone_mode=False
+        )
+    assert exc_info.value.exit_code == 2  # missing input file
+    assert "INPUT_FILE" in exc_info.value.format_message()
+    assert exc_info.value.ctx is not None
+    assert exc_info.value.ctx.get_usage().startswith(
+        "Usage: cli parse [OPTIONS] INPUT_FILE"
+    )
 
 
 @pytest.mark.asyncio
-async def test_parse(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("sys.stdin", STDIN)
-    runner = CliRunner()
-    result = await runner.invoke(cli, ["parse", "-"])
+async def test_parse(runner: CliRunner) -> None:
+    result = await runner.invoke(cli, ["parse", "-"], input=STDIN)
     assert result.exit_code == 0  # OK input file supplied
     assert result.output == ""
 
 
 @pytest.mark.asyncio
 async def test_monitor_no_port() -> None:
-    runner = CliRunner()
-    result = await runner.invoke(cli, ["monitor"])
-    assert result.exit_code == 2  # missing port name
-    assert result.output.startswith("Usage: cli monitor [OPTIONS] SERIAL_PORT")
+    with pytest.raises(click.UsageError) as exc_info:
+        await cli.commands["monitor"].main(
+            [], prog_name="cli monitor", standalone_mode=False
+        )
+    assert exc_info.value.exit_code == 2  # missing port name
+    assert "SERIAL_PORT" in exc_info.value.format_message()
+    assert exc_info.value.ctx is not None
+    assert exc_info.value.ctx.get_usage().startswith(
+        "Usage: cli monitor [OPTIONS] SERIAL_PORT"
+    )
 
 
 @pytest.mark.asyncio
-async def test_monitor(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
+async def test_monitor(monkeypatch: pytest.MonkeyPatch, runner: CliRunner) -> None:
     result = await runner.invoke(cli, ["monitor", "nullmodem"])
     assert result.exit_code == 0  # OK port name supplied
     assert "discovery is enabled" in result.output
 
 
 @pytest.mark.asyncio
-async def test_monitor_no_discovery(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_monitor_no_discovery(
+    monkeypatch: pytest.MonkeyPatch, runner: CliRunner
+) -> None:
     """Test monitor with explicit no-discovery flag."""
-    runner = CliRunner()
     result = await runner.invoke(cli, ["monitor", "nullmodem", "--no-discover"])
     assert result.exit_code == 0
     assert "discovery is enabled" not in result.output
@@ -178,15 +241,20 @@ async def test_monitor_no_discovery(monkeypatch: pytest.MonkeyPatch) -> None:
 
 @pytest.mark.asyncio
 async def test_execute_no_arg() -> None:
-    runner = CliRunner()
-    result = await runner.invoke(cli, ["execute"])
-    assert result.exit_code == 2  # missing command, port
-    assert result.output.startswith("Usage: cli execute [OPTIONS] SERIAL_PORT")
+    with pytest.raises(click.UsageError) as exc_info:
+        await cli.commands["execute"].main(
+            [], prog_name="cli execute", standalone_mode=False
+        )
+    assert exc_info.value.exit_code == 2  # missing command, port
+    assert "SERIAL_PORT" in exc_info.value.format_message()
+    assert exc_info.value.ctx is not None
+    assert exc_info.value.ctx.get_usage().startswith(
+        "Usage: cli execute [OPTIONS] SERIAL_PORT"
+    )
 
 
 @pytest.mark.asyncio
-async def test_execute(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
+async def test_execute(monkeypatch: pytest.MonkeyPatch, runner: CliRunner) -> None:
     result = await runner.invoke(cli, ["execute", CMD])
     assert result.exit_code == 0  # OK command supplied
     assert result.output == " - discovery is force-disabled\n"
@@ -194,15 +262,20 @@ async def test_execute(monkeypatch: pytest.MonkeyPatch) -> None:
 
 @pytest.mark.asyncio
 async def test_listen_no_arg() -> None:
-    runner = CliRunner()
-    result = await runner.invoke(cli, ["listen"])
-    assert result.exit_code == 2  # missing port
-    assert result.output.startswith("Usage: cli listen [OPTIONS] SERIAL_PORT")
+    with pytest.raises(click.UsageError) as exc_info:
+        await cli.commands["listen"].main(
+            [], prog_name="cli listen", standalone_mode=False
+        )
+    assert exc_info.value.exit_code == 2  # missing port
+    assert "SERIAL_PORT" in exc_info.value.format_message()
+    assert exc_info.value.ctx is not None
+    assert exc_info.value.ctx.get_usage().startswith(
+        "Usage: cli listen [OPTIONS] SERIAL_PORT"
+    )
 
 
 @pytest.mark.asyncio
-async def test_listen(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
+async def test_listen(monkeypatch: pytest.MonkeyPatch, runner: CliRunner) -> None:
     result = await runner.invoke(cli, ["listen", "nullmodem"])
     assert result.exit_code == 0  # OK port supplied
     assert result.output == " - sending is force-disabled\n"
@@ -260,9 +333,7 @@ def test_split_kwargs() -> None:
 
 
 @pytest.mark.asyncio
-async def test_print_summary(
-    mock_gateway: MagicMock, capsys: pytest.CaptureFixture[str]
-) -> None:
+async def test_print_summary(mock_gateway: MagicMock, printed: list[str]) -> None:
     """Test the summary printing function with various flags."""
     # Mock msg_db to be None to trigger the alternative branch in show_crazys
     mock_gateway.message_store = None
@@ -278,8 +349,7 @@ async def test_print_summary(
 
     await print_summary(mock_gateway, **kwargs)
 
-    captured = capsys.readouterr()
-    output = captured.out
+    output = "\n".join(printed)
 
     assert "Schema[Gateway]" in output
     assert "Params[Gateway]" in output
@@ -290,57 +360,64 @@ async def test_print_summary(
     assert "msg_0005" in output
 
 
+@pytest.mark.parametrize(
+    ("kwargs", "needle"),
+    [
+        pytest.param(
+            {
+                "get_faults": "01:123456",
+                "get_schedule": [None, None],
+                "set_schedule": [None, None],
+            },
+            "fault_data",
+            id="faults",
+        ),
+        pytest.param(
+            {
+                "get_faults": None,
+                "get_schedule": ["01:123456", "HW"],
+                "set_schedule": [None, None],
+            },
+            "Monday",
+            id="dhw_schedule",
+        ),
+        pytest.param(
+            {
+                "get_faults": None,
+                "get_schedule": ["01:123456", "01"],
+                "set_schedule": [None, None],
+            },
+            "Tuesday",
+            id="zone_schedule",
+        ),
+    ],
+)
 def test_print_results(
-    mock_gateway: MagicMock, capsys: pytest.CaptureFixture[str]
+    mock_gateway: MagicMock,
+    printed: list[str],
+    kwargs: dict[str, Any],
+    needle: str,
 ) -> None:
     """Test print_results with faults and schedules."""
-
-    # Test Faults
-    kwargs: dict[str, Any] = {
-        "get_faults": "01:123456",
-        "get_schedule": [None, None],
-        "set_schedule": [None, None],
-    }
-    print_results(mock_gateway, **kwargs)
-    out = capsys.readouterr().out
-    assert "fault_data" in out
-
-    # Test DHW Schedule
-    kwargs = {
-        "get_faults": None,
-        "get_schedule": ["01:123456", "HW"],
-        "set_schedule": [None, None],
-    }
     print_results(mock_gateway, **kwargs)
-    out = capsys.readouterr().out
-    assert "Monday" in out
-
-    # Test Zone Schedule
-    kwargs = {
-        "get_faults": None,
-        "get_schedule": ["01:123456", "01"],
-        "set_schedule": [None, None],
-    }
-    print_results(mock_gateway, **kwargs)
-    out = capsys.readouterr().out
-    assert "Tuesday" in out
+    assert needle in "\n".join(printed)
 
 
 @pytest.mark.asyncio
-async def test_print_engine_state(
-    mock_gateway: MagicMock, capsys: pytest.CaptureFixture[str]
-) -> None:
+async def test_print_engine_state(mock_gateway: MagicMock, printed: list[str]) -> None:
     """Test _print_engine_state."""
     kwargs: dict[str, Any] = {"print_state": 2}  # 2 implies print packets as well
     await _print_engine_state(mock_gateway, **kwargs)
 
-    out = capsys.readouterr().out
+    out = "\n".join(printed)
     assert "schema" in out
     assert "packets" in out
 
 
 @pytest.mark.asyncio
-async def test_async_main_kwargs_separation(mock_gateway: MagicMock) -> None:
+async def test_async_main_kwargs_separation(
+    mock_gateway: MagicMock, patched_client: SimpleNamespace
+) -> None:
     """Test that L7 config keys are not passed to EngineConfig.
 
     This ensures that Phase 2.77 decoupled traits (like known_list and hgi_id)
@@ -363,29 +440,27 @@ async def test_async_main_kwargs_separation(mock_gateway: MagicMock) -> None:
     }
 
     # ACT
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway) as mock_gwy_class,
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-    ):
-        await async_main(PARSE, lib_kwargs, **kwargs)
+    await async_main(PARSE, lib_kwargs, **kwargs)
 
-        call_kwargs = mock_gwy_class.call_args.kwargs
-        config_obj: GatewayConfig = call_kwargs["config"]
+    call_kwargs = patched_client.Gateway.call_args.kwargs
+    config_obj: GatewayConfig = call_kwargs["config"]
 
-        # ASSERT - L7 receives the dictionary
-        assert isinstance(config_obj, GatewayConfig)
-        assert config_obj.known_list == {"18:123456": {"class": "HGI", "faked": True}}
-        assert config_obj.hgi_id == "18:123456"
+    # ASSERT - L7 receives the dictionary
+    assert isinstance(config_obj, GatewayConfig)
+    assert config_obj.known_list == {"18:123456": {"class": "HGI", "faked": True}}
+    assert config_obj.hgi_id == "18:123456"
 
-        # ASSERT - L3 does NOT receive the nested dict from the kwargs unpacker
-        # EngineConfig defaults to None for these properties. We verify they
-        # were successfully filtered out during the dictionary comprehension.
-        assert config_obj.engine.known_list is None
-        assert config_obj.engine.hgi_id is None
+    # ASSERT - L3 does NOT receive the nested dict from the kwargs unpacker
+    # EngineConfig defaults to None for these properties. We verify they
+    # were successfully filtered out during the dictionary comprehension.
+    assert config_obj.engine.known_list is None
+    assert config_obj.engine.hgi_id is None
 
 
 @pytest.mark.asyncio
-async def test_async_main_parse(mock_gateway: MagicMock) -> None:
+async def test_async_main_parse(
+    mock_gateway: MagicMock, patched_client: SimpleNamespace
+) -> None:
     """Test async_main logic for the PARSE command and config validation."""
     lib_kwargs: dict[str, Any] = {
         SZ_CONFIG: {"reduce_processing": 0},
@@ -399,20 +474,16 @@ async def test_async_main_parse(mock_gateway: MagicMock) -> None:
         SZ_INPUT_FILE: "input.log",
     }
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway) as mock_gwy_class,
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-    ):
-        await async_main(PARSE, lib_kwargs, **kwargs)
+    await async_main(PARSE, lib_kwargs, **kwargs)
 
-        mock_gateway.start.assert_awaited_once()
-        mock_gateway.stop.assert_awaited_once()
+    mock_gateway.start.assert_awaited_once()
+    mock_gateway.stop.assert_awaited_once()
 
-        # Verify GatewayConfig was explicitly used and built correctly
-        call_kwargs = mock_gwy_class.call_args.kwargs
-        assert "config" in call_kwargs
-        assert isinstance(call_kwargs["config"], GatewayConfig)
-        assert call_kwargs["config"].reduce_processing == 0
+    # Verify GatewayConfig was explicitly used and built correctly
+    call_kwargs = patched_client.Gateway.call_args.kwargs
+    assert "config" in call_kwargs
+    assert isinstance(call_kwargs["config"], GatewayConfig)
+    assert call_kwargs["config"].reduce_processing == 0
 
 
 @pytest.mark.asyncio
@@ -439,18 +510,21 @@ async def test_async_main_real_gateway_init() -> None:
     }
 
     with (
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-        patch("ramses_rf.gateway.Gateway.start", new_callable=AsyncMock) as mock_start,
-        patch("ramses_rf.gateway.Gateway.stop", new_callable=AsyncMock) as mock_stop,
+        patch.object(
+            client_module, "normalise_config", return_value=(None, lib_kwargs)
+        ),
+        patch.multiple(Gateway, start=DEFAULT, stop=DEFAULT) as mocks,
     ):
         await async_main(PARSE, lib_kwargs, **kwargs)
 
-        mock_start.assert_awaited_once()
-        mock_stop.assert_awaited_once()
+        mocks["start"].assert_awaited_once()
+        mocks["stop"].assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_async_main_execute(mock_gateway: MagicMock) -> None:
+async def test_async_main_execute(
+    mock_gateway: MagicMock, patched_client: SimpleNamespace
+) -> None:
     """Test async_main logic for the EXECUTE command."""
     lib_kwargs: dict[str, Any] = {
         SZ_CONFIG: {
@@ -474,19 +548,18 @@ async def test_async_main_execute(mock_gateway: MagicMock) -> None:
     async def mock_task() -> None:
         pass
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch("ramses_cli.client.spawn_scripts", return_value=[mock_task()]),
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-    ):
-        await async_main(EXECUTE, lib_kwargs, **kwargs)
+    patched_client.spawn_scripts.return_value = [mock_task()]
 
-        mock_gateway.start.assert_awaited_once()
-        mock_gateway.stop.assert_awaited_once()
+    await async_main(EXECUTE, lib_kwargs, **kwargs)
+
+    mock_gateway.start.assert_awaited_once()
+    mock_gateway.stop.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_async_main_monitor(mock_gateway: MagicMock) -> None:
+async def test_async_main_monitor(
+    mock_gateway: MagicMock, patched_client: SimpleNamespace
+) -> None:
     """Test async_main logic for the MONITOR command."""
     lib_kwargs: dict[str, Any] = {
         SZ_CONFIG: {"reduce_processing": 0},
@@ -500,27 +573,22 @@ async def test_async_main_monitor(mock_gateway: MagicMock) -> None:
         "exec_scr": None,  # Simple monitor
     }
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch("ramses_cli.client.spawn_scripts", return_value=[]),
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-    ):
-        await async_main(MONITOR, lib_kwargs, **kwargs)
+    await async_main(MONITOR, lib_kwargs, **kwargs)
 
-        mock_gateway.start.assert_awaited_once()
-        mock_gateway.stop.assert_awaited_once()
+    mock_gateway.start.assert_awaited_once()
+    mock_gateway.stop.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_async_main_restore_schema(mock_gateway: MagicMock) -> None:
+async def test_async_main_restore_schema(
+    mock_gateway: MagicMock, patched_client: SimpleNamespace
+) -> None:
     """Test async_main with restore_schema functionality."""
     lib_kwargs: dict[str, Any] = {SZ_CONFIG: {"reduce_processing": 0}}
 
     # Mock a file object for restore_schema
     mock_file = MagicMock()
-    mock_file.read.return_value = json.dumps(
-        {"data": {"client_state": {"schema": {"restored": "value"}, "packets": []}}}
-    )
+    mock_file.read.return_value = _RESTORE_PAYLOAD
     # Make json.load work on the mock
     mock_file.__enter__.return_value = mock_file
 
@@ -531,14 +599,7 @@ async def test_async_main_restore_schema(mock_gateway: MagicMock) -> None:
         "print_state": 0,
     }
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch(
-            "json.load",
-            return_value={"data": {"client_state": {"schema": {}, "packets": []}}},
-        ),
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-    ):
+    with patch("json.load", return_value=_RESTORE_STATE):
         await async_main(LISTEN, lib_kwargs, **kwargs)
         # Verify gateway initialized (implicit in logic)
         mock_gateway.start.assert_awaited()
@@ -546,7 +607,9 @@ async def test_async_main_restore_schema(mock_gateway: MagicMock) -> None:
 
 @pytest.mark.asyncio
 async def test_async_main_msg_handler(
-    mock_gateway: MagicMock, capsys: pytest.CaptureFixture[str]
+    mock_gateway: MagicMock,
+    patched_client: SimpleNamespace,
+    printed: list[str],
 ) -> None:
     """Test the internal handle_msg callback logic inside async_main."""
     lib_kwargs: dict[str, Any] = {
@@ -569,51 +632,47 @@ async def test_async_main_msg_handler(
 
     mock_gateway.add_msg_handler.side_effect = capture_cb
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch(
-            "ramses_cli.client.normalise_config",
-            return_value=(None, lib_kwargs),
-        ),
-    ):
-        # Run main to trigger registration
-        await async_main(PARSE, lib_kwargs, **kwargs)
-
-        assert captured_callback is not None
-
-        # Now test the callback with different message types
-        # 1. Puzzle message
-        msg1 = MagicMock(spec=Message)
-        msg1.dtm = dt.now()
-        msg1.code = Code._PUZZ
-        # Mypy dislikes assigning to method slots on mocks without ignore
-        msg1.__repr__ = MagicMock(return_value="PUZZLE_MSG")  # type: ignore[method-assign]
-
-        with patch("ramses_cli.client.Message", return_value=msg1):
-            await captured_callback(MagicMock())
-        out = capsys.readouterr().out
-        assert "PUZZLE_MSG" in out
-
-        # 2. 1F09 (I) message
-        # Use a fresh mock object to avoid state pollution
-        msg2 = MagicMock(spec=Message)
-        msg2.dtm = dt.now()
-        msg2.code = Code._1F09
-        msg2.verb = I_
-        # Fix: Ensure src attribute exists for HGI check in handle_msg
-        msg2.src = MagicMock()
-        msg2.src.type = "01"  # Controller type, definitely not HGI
-        msg2.__repr__ = MagicMock(return_value="1F09_MSG")  # type: ignore[method-assign]
-
-        with patch("ramses_cli.client.Message", return_value=msg2):
-            await captured_callback(MagicMock())
-        out = capsys.readouterr().out
-        assert "1F09_MSG" in out
+    # Run main to trigger registration
+    await async_main(PARSE, lib_kwargs, **kwargs)
+
+    assert captured_callback is not None
+
+    # Now test the callback with different message types
+    # 1. Puzzle message
+    msg1 = MagicMock(spec=Message)
+    msg1.dtm = _FIXED_DTM
+    msg1.code = Code._PUZZ
+    # Mypy dislikes assigning to method slots on mocks without ignore
+    msg1.__repr__ = MagicMock(return_value="PUZZLE_MSG")  # type: ignore[method-assign]
+
+    with patch("ramses_cli.client.Message", return_value=msg1):
+        await captured_callback(MagicMock())
+    out = "\n".join(printed)
+    printed.clear()
+    assert "PUZZLE_MSG" in out
+
+    # 2. 1F09 (I) message
+    # Use a fresh mock object to avoid state pollution
+    msg2 = MagicMock(spec=Message)
+    msg2.dtm = _FIXED_DTM
+    msg2.code = Code._1F09
+    msg2.verb = I_
+    # Fix: Ensure src attribute exists for HGI check in handle_msg
+    msg2.src = MagicMock()
+    msg2.src.type = "01"  # Controller type, definitely not HGI
+    msg2.__repr__ = MagicMock(return_value="1F09_MSG")  # type: ignore[method-assign]
+
+    with patch("ramses_cli.client.Message", return_value=msg2):
+        await captured_callback(MagicMock())
+    out = "\n".join(printed)
+    assert "1F09_MSG" in out
 
 
 @pytest.mark.asyncio
 async def test_async_main_long_format(
-    mock_gateway: MagicMock, capsys: pytest.CaptureFixture[str]
+    mock_gateway: MagicMock,
+    patched_client: SimpleNamespace,
+    printed: list[str],
 ) -> None:
     """Test the long_format output branch in handle_msg."""
     lib_kwargs: dict[str, Any] = {
@@ -636,35 +695,41 @@ async def test_async_main_long_format(
 
     mock_gateway.add_msg_handler.side_effect = capture_cb
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch(
-            "ramses_cli.client.normalise_config",
-            return_value=(None, lib_kwargs),
-        ),
-    ):
-        await async_main(PARSE, lib_kwargs, **kwargs)
+    await async_main(PARSE, lib_kwargs, **kwargs)
 
-        # Trigger callback
-        msg = MagicMock(spec=Message)
-        msg.dtm = dt.now()
-        msg.__repr__ = MagicMock(return_value="LONG_MSG")  # type: ignore[method-assign]
-        msg.payload = "PAYLOAD"
+    # Trigger callback
+    msg = MagicMock(spec=Message)
+    msg.dtm = _FIXED_DTM
+    msg.__repr__ = MagicMock(return_value="LONG_MSG")  # type: ignore[method-assign]
+    msg.payload = "PAYLOAD"
 
-        assert captured_callback is not None
-        with patch("ramses_cli.client.Message", return_value=msg):
-            await captured_callback(MagicMock())
+    assert captured_callback is not None
+    with patch("ramses_cli.client.Message", return_value=msg):
+        await captured_callback(MagicMock())
 
-        out = capsys.readouterr().out
-        # Verify long format output (timestamp ... repr # payload)
-        assert "LONG_MSG" in out
-        assert "..." in out
-        assert "# PAYLOAD" in out
+    out = "\n".join(printed)
+    # Verify long format output (timestamp ... repr # payload)
+    assert "LONG_MSG" in out
+    assert "..." in out
+    assert "# PAYLOAD" in out
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("exc_cls", "args", "needle"),
+    [
+        (asyncio.CancelledError, (), "CancelledError"),
+        (GracefulExit, (), "GracefulExit"),
+        (exc.RamsesException, ("Test Error",), "RamsesException"),
+    ],
+)
 async def test_async_main_exceptions(
-    mock_gateway: MagicMock, capsys: pytest.CaptureFixture[str]
+    mock_gateway: MagicMock,
+    patched_client: SimpleNamespace,
+    capsys: pytest.CaptureFixture[str],
+    exc_cls: type[BaseException],
+    args: tuple[str, ...],
+    needle: str,
 ) -> None:
     """Test exception handling in async_main."""
     lib_kwargs: dict[str, Any] = {
@@ -677,29 +742,14 @@ async def test_async_main_exceptions(
         "restore_state": None,
         "print_state": 0,
     }
+    mock_gateway.start.side_effect = exc_cls(*args)
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-    ):
-        # Test CancelledError
-        mock_gateway.start.side_effect = asyncio.CancelledError
-        await async_main(PARSE, lib_kwargs, **kwargs)
-        out = capsys.readouterr().out
-        assert "CancelledError" in out
-
-        # Test GracefulExit
-        mock_gateway.start.side_effect = GracefulExit
-        await async_main(PARSE, lib_kwargs, **kwargs)
-        out = capsys.readouterr().out
-        assert "GracefulExit" in out
+    await async_main(PARSE, lib_kwargs, **kwargs)
 
-        # Test RamsesException
-        mock_gateway.start.side_effect = exc.RamsesException("Test Error")
-        await async_main(PARSE, lib_kwargs, **kwargs)
-        out = capsys.readouterr().out
-        assert "RamsesException" in out
-        assert "Test Error" in out
+    out = capsys.readouterr().out
+    assert needle in out
+    for arg in args:
+        assert arg in out
 
 
 def test_convert() -> None:
@@ -715,40 +765,31 @@ def test_convert() -> None:
 
 
 @pytest.mark.asyncio
-async def test_cli_debug_mode(mock_gateway: MagicMock) -> None:
+async def test_cli_debug_mode(mock_gateway: MagicMock, runner: CliRunner) -> None:
     """Test that the debug flag triggers the debugger."""
     with patch("ramses_cli.client.start_debugging") as mock_debug:
-        runner = CliRunner()
         # invoke cli with -z (debug) count 1
         await runner.invoke(cli, ["-z", "parse", "/dev/null"])
         mock_debug.assert_called_once_with(True)
 
 
 @pytest.mark.asyncio
-async def test_cli_config_file(mock_gateway: MagicMock) -> None:
+async def test_cli_config_file(
+    mock_gateway: MagicMock, config_file: str, runner: CliRunner
+) -> None:
     """Test loading a configuration file via the CLI."""
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        # Write config file synchronously before invoking CLI
-        with open("test_config.json", "w") as f:
-            json.dump({"config": {"disable_discovery": True}}, f)
+    # Run CLI with -c pointing to the session-wide config file
+    result = await runner.invoke(cli, ["-c", config_file, "parse", os.devnull])
 
-        # Run CLI with -c pointing to the locally closed file
-        result = await runner.invoke(
-            cli, ["-c", "test_config.json", "parse", "/dev/null"]
-        )
-
-        assert result.exit_code == 0
-        # Verify the config was actually merged (by checking the internal call)
-        # Note: We rely on normalise_config patching in async_main tests usually,
-        # but here we just want to ensure it runs without error.
+    assert result.exit_code == 0
+    # Verify the config was actually merged (by checking the internal call)
+    # Note: We rely on normalise_config patching in async_main tests usually,
+    # but here we just want to ensure it runs without error.
 
 
 @pytest.mark.asyncio
-async def test_execute_flags(mock_gateway: MagicMock) -> None:
+async def test_execute_flags(mock_gateway: MagicMock, runner: CliRunner) -> None:
     """Test that execute flags (like --get-faults) enforce the known_list."""
-    runner = CliRunner()
-
     # Running execute with a specific device target should force-enable the known_list
     result = await runner.invoke(
         cli, ["execute", "/dev/null", "--get-faults", "01:123456"]
@@ -759,8 +800,17 @@ async def test_execute_flags(mock_gateway: MagicMock) -> None:
     assert "known list is force-configured" in result.output
 
 
+class _StateSink(io.StringIO):
+    """An in-memory file that keeps its buffer readable after the with block."""
+
+    def close(self) -> None:
+        pass
+
+
 @pytest.mark.asyncio
-async def test__save_state(mock_gateway: MagicMock) -> None:
+async def test__save_state(
+    mock_gateway: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Test _save_state writes schema and packets to files."""
     # Setup mock gateway state
     mock_gateway.get_state.return_value = (
@@ -768,24 +818,29 @@ async def test__save_state(mock_gateway: MagicMock) -> None:
         {"2023-01-01T00:00:00": "pkt_line"},
     )
 
-    with patch("builtins.open", new_callable=mock_open) as mock_file:
-        await _save_state(mock_gateway)
+    # Shadow open() in the client module only, rather than patching builtins
+    writes: dict[str, _StateSink] = {}
+
+    def fake_open(path: str, mode: str = "r", *args: Any, **kwargs: Any) -> _StateSink:
+        writes[path] = _StateSink()
+        return writes[path]
+
+    monkeypatch.setattr("ramses_cli.client.open", fake_open, raising=False)
 
-        # Verify open was called twice (once for log, once for json)
-        assert mock_file.call_count == 2
+    await _save_state(mock_gateway)
 
-        # Check that expected files were opened
-        calls = mock_file.call_args_list
-        filenames = [c[0][0] for c in calls]
-        assert "state_msgs.log" in filenames
-        assert "state_schema.json" in filenames
+    # Verify open was called twice (once for log, once for json)
+    assert len(writes) == 2
+
+    # Check that expected files were written
+    assert "pkt_line" in writes["state_msgs.log"].getvalue()
+    assert "schema_data" in writes["state_schema.json"].getvalue()
 
 
 @pytest.mark.asyncio
-async def test_parse_command_passes_input_file() -> None:
+async def test_parse_command_passes_input_file(runner: CliRunner) -> None:
     """Verify that 'client.py parse' correctly puts input_file into lib_kwargs."""
 
-    runner = CliRunner()
     fake_log_file = "test_capture.log"
 
     # standalone_mode=False allows us to see the return value of the command
@@ -859,7 +914,9 @@ def test_run_cli_valid() -> None:
 
 
 @pytest.mark.asyncio
-async def test_async_main_scan(mock_gateway: MagicMock) -> None:
+async def test_async_main_scan(
+    mock_gateway: MagicMock, patched_client: SimpleNamespace
+) -> None:
     """Test async_main logic for the SCAN command."""
     from ramses_cli.client import SCAN
 
@@ -877,11 +934,7 @@ async def test_async_main_scan(mock_gateway: MagicMock) -> None:
         "scan_output": None,
     }
 
-    with (
-        patch("ramses_cli.client.Gateway", return_value=mock_gateway),
-        patch("ramses_cli.client.normalise_config", return_value=(None, lib_kwargs)),
-        patch("ramses_cli.client.DiscoveryScan") as mock_scan_cls,
-    ):
+    with patch.object(client_module, "DiscoveryScan") as mock_scan_cls:
         mock_scan_engine = MagicMock()
         mock_scan_engine.start = MagicMock()
         mock_scan_engine.stop = MagicMock()
@@ -1003,7 +1056,7 @@ def test_print_scan_results_export_to_file(
 
 
 @pytest.mark.asyncio
-async def test_scan_command_disables_sending_and_discovery() -> None:
+async def test_scan_command_disables_sending_and_discovery(runner: CliRunner) -> None:
     """Test that the scan command callback forces disable_sending and disable_discovery."""
     from ramses_cli.client import SCAN, cli
     from ramses_rf.schemas import SZ_CONFIG, SZ_DISABLE_DISCOVERY
@@ -1011,7 +1064,6 @@ async def test_scan_command_disables_sending_and_discovery() -> None:
     lib_config: dict[str, Any] = {SZ_CONFIG: {}}
     cli_config: dict[str, Any] = {}
 
-    runner = CliRunner()
     with patch("ramses_cli.client.split_kwargs", return_value=(cli_config, lib_config)):
         # standalone_mode=False returns the command's return value
         result = await runner.invoke(
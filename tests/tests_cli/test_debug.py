@@ -2,26 +2,33 @@
 """Unittests for the ramses_cli debug.py module."""
 
 import sys
-from unittest.mock import MagicMock, patch
+from collections.abc import Generator
+from unittest.mock import MagicMock
 
 import pytest
 
 from ramses_cli.debug import DEBUG_ADDR, DEBUG_PORT, start_debugging
 
 
-def test_start_debugging_no_wait(capsys: pytest.CaptureFixture[str]) -> None:
-    """Test start_debugging with wait_for_client=False."""
-    mock_debugpy = MagicMock()
+@pytest.fixture
+def debugpy_stub(monkeypatch: pytest.MonkeyPatch) -> Generator[MagicMock, None, None]:
+    """Intercept the import of debugpy inside start_debugging."""
+    stub = MagicMock()
+    monkeypatch.setitem(sys.modules, "debugpy", stub)
+    yield stub
+
 
-    # Patch sys.modules to intercept the import inside the function
-    with patch.dict(sys.modules, {"debugpy": mock_debugpy}):
-        start_debugging(wait_for_client=False)
+def test_start_debugging_no_wait(
+    debugpy_stub: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test start_debugging with wait_for_client=False."""
+    start_debugging(wait_for_client=False)
 
     # Verify listen was called correctly
-    mock_debugpy.listen.assert_called_once_with(address=(DEBUG_ADDR, DEBUG_PORT))
+    debugpy_stub.listen.assert_called_once_with(address=(DEBUG_ADDR, DEBUG_PORT))
 
     # Verify wait_for_client was NOT called
-    mock_debugpy.wait_for_client.assert_not_called()
+    debugpy_stub.wait_for_client.assert_not_called()
 
     # Verify console output
     captured = capsys.readouterr()
@@ -31,18 +38,17 @@ def test_start_debugging_no_wait(capsys: pytest.CaptureFixture[str]) -> None:
     assert "execution paused" not in captured.out
 
 
-def test_start_debugging_wait(capsys: pytest.CaptureFixture[str]) -> None:
+def test_start_debugging_wait(
+    debugpy_stub: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
     """Test start_debugging with wait_for_client=True."""
-    mock_debugpy = MagicMock()
-
-    with patch.dict(sys.modules, {"debugpy": mock_debugpy}):
-        start_debugging(wait_for_client=True)
+    start_debugging(wait_for_client=True)
 
     # Verify listen was called
-    mock_debugpy.listen.assert_called_once_with(address=(DEBUG_ADDR, DEBUG_PORT))
+    debugpy_stub.listen.assert_called_once_with(address=(DEBUG_ADDR, DEBUG_PORT))
 
     # Verify wait_for_client WAS called
-    mock_debugpy.wait_for_client.assert_called_once()
+    debugpy_stub.wait_for_client.assert_called_once()
 
     # Verify console output
     captured = capsys.readouterr()
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 """Unittests for the ramses_cli discovery.py module."""
 
+import copy
+import inspect
+import json
+from collections.abc import Awaitable, Callable, Generator
+from operator import attrgetter
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -31,150 +37,136 @@ from ramses_cli.discovery import (
 )
 from ramses_rf.const import SZ_SCHEDULE, SZ_ZONE_IDX
 from ramses_rf.gateway import Gateway
+from ramses_tx.const import Code
 
 # Constants for testing
 DEV_ID = "01:123456"
+SCHED_JSON = json.dumps({SZ_ZONE_IDX: "01", SZ_SCHEDULE: []})
+EXEC_CMD_STR = f"RQ --- {DEV_ID} --:------ {DEV_ID} 1F09 00"
 
 
-@pytest.fixture
-def mock_gateway() -> MagicMock:
-    """Create a mock Gateway instance."""
-    gateway = MagicMock(spec=Gateway)
+@pytest.fixture(scope="module")
+def mock_gateway(gateway_template: MagicMock) -> MagicMock:
+    """Create a mock Gateway instance, shared by the tests of this module."""
+    gateway = copy.deepcopy(gateway_template)
     # Important: Set the class so isinstance(gwy, Gateway) returns True
     gateway.__class__ = Gateway  # type: ignore[assignment]
 
-    gateway.send_cmd = MagicMock()
-    gateway.async_send_cmd = AsyncMock()
-
-    # Fix: explicitly attach the _engine mock to bypass the spec
-    gateway._engine = MagicMock()
-    gateway._engine._tasks = []
-    gateway._engine.ser_name = "/dev/ttyUSB0"
-
     # Mock device retrieval
-    mock_dev = MagicMock()
-    mock_dev.id = DEV_ID
-    mock_dev.tcs = MagicMock()
-    # Ensure nested mocks for schedule/zone calls return async mocks
-    mock_dev.tcs.get_faultlog = AsyncMock()
-    mock_dev.tcs.get_htg_zone.return_value.get_schedule = AsyncMock()
-    mock_dev.tcs.get_htg_zone.return_value.set_schedule = AsyncMock()
-
-    # Mock the discovery component and its discover method
-    mock_dev.discovery = MagicMock()
-    mock_dev.discovery.discover = AsyncMock()
-
-    # Mock fakeable for binding tests
-    mock_dev._make_fake = MagicMock()
-    mock_dev._initiate_binding_process = AsyncMock()
-    mock_dev._wait_for_binding_request = AsyncMock()
-
-    gateway.device_registry.get_device.return_value = mock_dev
-
-    # IMPORTANT: Configure config so scripts don't return early
-    gateway.config = MagicMock()
-    gateway.config.disable_discovery = False
-    gateway.config.enable_eavesdrop = False
+    mock_dev = MagicMock(
+        id=DEV_ID,
+        # Mock the discovery component and its discover method
+        discovery=MagicMock(discover=AsyncMock()),
+    )
+    mock_dev.configure_mock(
+        **{
+            # Ensure nested mocks for schedule/zone calls return async mocks
+            "tcs.get_faultlog": AsyncMock(),
+            "tcs.get_htg_zone.return_value.get_schedule": AsyncMock(),
+            "tcs.get_htg_zone.return_value.set_schedule": AsyncMock(),
+        }
+    )
+
+    gateway.configure_mock(
+        **{
+            "send_cmd": MagicMock(),
+            "async_send_cmd": AsyncMock(),
+            # Fix: explicitly attach the _engine mock to bypass the spec
+            "_engine": MagicMock(_tasks=[], ser_name="/dev/ttyUSB0"),
+            "device_registry.get_device.return_value": mock_dev,
+        }
+    )
 
     return gateway
 
 
-@pytest.mark.asyncio
-async def test_spawn_scripts_exec_cmd(mock_gateway: MagicMock) -> None:
-    """Test spawning exec_cmd."""
-    kwargs = {EXEC_CMD: "RQ --- 01:123456 --:------ 01:123456 1F09 00"}
-    tasks = spawn_scripts(mock_gateway, **kwargs)
-    assert len(tasks) == 1
-    assert len(mock_gateway._engine._tasks) == 1
-
-
-@pytest.mark.asyncio
-async def test_spawn_scripts_get_faults(mock_gateway: MagicMock) -> None:
-    """Test spawning get_faults."""
-    kwargs = {GET_FAULTS: DEV_ID}
-    tasks = spawn_scripts(mock_gateway, **kwargs)
-    assert len(tasks) == 1
-
-
-@pytest.mark.asyncio
-async def test_spawn_scripts_get_schedule(mock_gateway: MagicMock) -> None:
-    """Test spawning get_schedule."""
-    kwargs = {GET_SCHED: (DEV_ID, "01")}
-    tasks = spawn_scripts(mock_gateway, **kwargs)
-    assert len(tasks) == 1
-
-
-@pytest.mark.asyncio
-async def test_spawn_scripts_set_schedule(mock_gateway: MagicMock) -> None:
-    """Test spawning set_schedule."""
-    sched_json = f'{{"{SZ_ZONE_IDX}": "01", "{SZ_SCHEDULE}": []}}'
-    kwargs = {SET_SCHED: (DEV_ID, sched_json)}
-    tasks = spawn_scripts(mock_gateway, **kwargs)
-    assert len(tasks) == 1
-
-
-@pytest.mark.asyncio
-async def test_spawn_scripts_exec_scr_valid(mock_gateway: MagicMock) -> None:
-    """Test spawning a valid script."""
+@pytest.fixture(autouse=True)
+def reset_mock_gateway(mock_gateway: MagicMock) -> Generator[None, None, None]:
+    """Clear the shared mock Gateway's call history after each test."""
+    yield
+    mock_gateway.reset_mock()
+    mock_gateway._engine._tasks = []
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        pytest.param(
+            {EXEC_CMD: EXEC_CMD_STR},
+            1,
+            id="exec_cmd",
+        ),
+        pytest.param({GET_FAULTS: DEV_ID}, 1, id="get_faults"),
+        pytest.param({GET_SCHED: (DEV_ID, "01")}, 1, id="get_schedule"),
+        pytest.param({SET_SCHED: (DEV_ID, SCHED_JSON)}, 1, id="set_schedule"),
+        pytest.param({EXEC_SCR: ("scan_disc", DEV_ID)}, 1, id="exec_scr_valid"),
+        pytest.param(
+            {EXEC_SCR: ("invalid_script_name", DEV_ID)}, 0, id="exec_scr_invalid"
+        ),
+    ],
+)
+async def test_spawn_scripts(
+    mock_gateway: MagicMock, kwargs: dict[str, Any], expected: int
+) -> None:
+    """Test spawning the scripts (must be async, to provide a loop for create_task)."""
     # ISOLATION: We replace the lookup table so 'scan_disc' points to a simple AsyncMock.
-    # This prevents spawn_scripts from running the REAL decorated script (which returns None),
+    # This prevents spawn_scripts from running the REAL decorated script,
     # ensuring it receives a valid awaitable as it expects.
     mock_script = AsyncMock()
     with patch.dict("ramses_cli.discovery.SCRIPTS", {"scan_disc": mock_script}):
-        script_name = "scan_disc"
-        kwargs = {EXEC_SCR: (script_name, DEV_ID)}
-
         tasks = spawn_scripts(mock_gateway, **kwargs)
 
-        # Verify dispatch occurred
-        assert len(tasks) == 1
+    assert len(tasks) == expected
+    assert len(mock_gateway._engine._tasks) == expected
+    if kwargs.get(EXEC_SCR) == ("scan_disc", DEV_ID):  # verify dispatch occurred
         mock_script.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_spawn_scripts_exec_scr_invalid(mock_gateway: MagicMock) -> None:
-    """Test spawning an invalid script."""
-    kwargs = {EXEC_SCR: ("invalid_script_name", DEV_ID)}
-    tasks = spawn_scripts(mock_gateway, **kwargs)
-    assert len(tasks) == 0
-
-
-@pytest.mark.asyncio
-async def test_execution_of_exec_cmd(mock_gateway: MagicMock) -> None:
-    """Test execution of exec_cmd logic."""
-    kwargs = {EXEC_CMD: "RQ --- 01:123456 --:------ 01:123456 1F09 00"}
-    await exec_cmd(mock_gateway, **kwargs)
-    mock_gateway.async_send_cmd.assert_awaited()
-
-
-@pytest.mark.asyncio
-async def test_execution_of_get_faults(mock_gateway: MagicMock) -> None:
-    """Test execution of get_faults logic."""
-    await get_faults(mock_gateway, DEV_ID)  # type: ignore[arg-type]
-    mock_dev = mock_gateway.device_registry.get_device(DEV_ID)
-    mock_dev.tcs.get_faultlog.assert_awaited_once()
-
-
-@pytest.mark.asyncio
-async def test_execution_of_get_schedule(mock_gateway: MagicMock) -> None:
-    """Test execution of get_schedule logic."""
-    await get_schedule(mock_gateway, DEV_ID, "01")  # type: ignore[arg-type]
-    mock_dev = mock_gateway.device_registry.get_device(DEV_ID)
-    mock_zone = mock_dev.tcs.get_htg_zone("01")
-    mock_zone.get_schedule.assert_awaited_once()
-
-
-@pytest.mark.asyncio
-async def test_execution_of_set_schedule(mock_gateway: MagicMock) -> None:
-    """Test execution of set_schedule logic."""
-    sched_json = f'{{"{SZ_ZONE_IDX}": "01", "{SZ_SCHEDULE}": []}}'
-    await set_schedule(mock_gateway, DEV_ID, sched_json)  # type: ignore[arg-type]
-    mock_dev = mock_gateway.device_registry.get_device(DEV_ID)
-    mock_zone = mock_dev.tcs.get_htg_zone("01")
-    mock_zone.set_schedule.assert_awaited_once()
+@pytest.mark.parametrize(
+    ("fnc", "args", "kwargs", "awaited"),
+    [
+        pytest.param(
+            exec_cmd,
+            (),
+            {EXEC_CMD: EXEC_CMD_STR},
+            "async_send_cmd",
+            id="exec_cmd",
+        ),
+        pytest.param(
+            get_faults,
+            (DEV_ID,),
+            {},
+            "device_registry.get_device.return_value.tcs.get_faultlog",
+            id="get_faults",
+        ),
+        pytest.param(
+            get_schedule,
+            (DEV_ID, "01"),
+            {},
+            "device_registry.get_device.return_value.tcs.get_htg_zone.return_value.get_schedule",
+            id="get_schedule",
+        ),
+        pytest.param(
+            set_schedule,
+            (DEV_ID, SCHED_JSON),
+            {},
+            "device_registry.get_device.return_value.tcs.get_htg_zone.return_value.set_schedule",
+            id="set_schedule",
+        ),
+    ],
+)
+async def test_execution(
+    mock_gateway: MagicMock,
+    fnc: Callable[..., Awaitable[None]],
+    args: tuple[str, ...],
+    kwargs: dict[str, str],
+    awaited: str,
+) -> None:
+    """Test execution of the exec_cmd/get_faults/get_schedule/set_schedule logic."""
+    await fnc(mock_gateway, *args, **kwargs)
+    attrgetter(awaited)(mock_gateway).assert_awaited_once()
 
 
-@pytest.mark.asyncio
 async def test_script_decorator_behavior(mock_gateway: MagicMock) -> None:
     """Test that script decorator sends start/end commands and executes body."""
 
@@ -195,88 +187,95 @@ async def test_script_decorator_behavior(mock_gateway: MagicMock) -> None:
     mock_body.assert_awaited_once_with(mock_gateway, DEV_ID)
 
 
-@pytest.mark.asyncio
 async def test_script_scan_disc(mock_gateway: MagicMock) -> None:
     """Test script_scan_disc."""
     await script_scan_disc(mock_gateway, DEV_ID)
-    mock_dev = mock_gateway.device_registry.get_device(DEV_ID)
-    mock_gateway.polling_manager.update_device_tasks.assert_called_once_with(mock_dev)
-
-
-@pytest.mark.asyncio
-async def test_script_scan_full(mock_gateway: MagicMock) -> None:
-    """Test script_scan_full iterates through codes."""
-    # Patch range to only loop once to avoid massive execution time
-    with patch("ramses_cli.discovery.range", return_value=iter([1])):
-        await script_scan_full(mock_gateway, DEV_ID)
-
-    assert mock_gateway.send_cmd.called
+    get_device = mock_gateway.device_registry.get_device
+    get_device.assert_called_once_with(DEV_ID)
+    mock_gateway.polling_manager.update_device_tasks.assert_called_once_with(
+        get_device.return_value
+    )
 
 
-@pytest.mark.asyncio
-async def test_script_scan_hard(mock_gateway: MagicMock) -> None:
-    """Test script_scan_hard."""
-    # Patch range to limit execution
-    with patch("ramses_cli.discovery.range", return_value=iter([0x4FFF])):
-        await script_scan_hard(mock_gateway, DEV_ID)
+@pytest.fixture
+def bounded_scans(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Trim the codes/IDs iterated over by the scan scripts to a single one."""
+    monkeypatch.setattr("ramses_cli.discovery._SCAN_FULL_CODES", (Code._1F09,))
+    monkeypatch.setattr("ramses_cli.discovery._SCAN_HARD_END", 1)
+    monkeypatch.setattr("ramses_cli.discovery._SCAN_OTB_HARD_RANGE", range(1))
+
+
+@pytest.mark.usefixtures("bounded_scans")
+@pytest.mark.parametrize(
+    "script",
+    [
+        script_scan_full,
+        script_scan_hard,
+        script_scan_fan,
+        script_scan_otb,
+        script_scan_otb_map,
+        script_scan_otb_ramses,
+        script_scan_otb_hard,
+    ],
+    ids=lambda f: f.__name__,
+)
+async def test_script_scan(
+    mock_gateway: MagicMock, script: Callable[..., Awaitable[None]]
+) -> None:
+    """Test each scan script sends its commands."""
+    # Bypass script_decorator (see test_script_decorator_behavior)
+    await inspect.unwrap(script)(mock_gateway, DEV_ID)
 
-    assert mock_gateway.send_cmd.called or mock_gateway.async_send_cmd.called
+    assert mock_gateway.send_cmd.called or mock_gateway.async_send_cmd.await_count
 
 
-@pytest.mark.asyncio
-async def test_script_scan_fan(mock_gateway: MagicMock) -> None:
-    """Test script_scan_fan."""
-    await script_scan_fan(mock_gateway, DEV_ID)
-    assert mock_gateway.send_cmd.called
+class MockFakeable:
+    """Stand in for Fakeable, with the binding methods awaited by the scripts."""
 
+    def __init__(self) -> None:
+        self._make_fake = MagicMock()
+        self._initiate_binding_process = AsyncMock()
+        self._wait_for_binding_request = AsyncMock()
 
-@pytest.mark.asyncio
-async def test_script_scan_otb_group(mock_gateway: MagicMock) -> None:
-    """Test various OTB scan scripts."""
-    # Use patched range for the hard scan too if it loops
-    with patch("ramses_cli.discovery.range", return_value=iter([1])):
-        await script_scan_otb(mock_gateway, DEV_ID)
-        await script_scan_otb_map(mock_gateway, DEV_ID)
-        await script_scan_otb_ramses(mock_gateway, DEV_ID)
-        await script_scan_otb_hard(mock_gateway, DEV_ID)
 
-    assert mock_gateway.send_cmd.call_count > 5
+class NotFakeable:
+    """Stand in for Fakeable, so the mock device is definitely not an instance of it."""
 
 
-@pytest.mark.asyncio
-async def test_script_binding(mock_gateway: MagicMock) -> None:
+@pytest.fixture
+def fakeable_gateway(
+    mock_gateway: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> MagicMock:
+    """Return the mock Gateway, with its device an instance of (a patched) Fakeable."""
+    # The mock gateway is shared, so its device must be restored afterwards
+    monkeypatch.setattr(
+        mock_gateway.device_registry.get_device, "return_value", MockFakeable()
+    )
+    monkeypatch.setattr("ramses_cli.discovery.Fakeable", MockFakeable)
+    return mock_gateway
+
+
+async def test_script_binding(fakeable_gateway: MagicMock) -> None:
     """Test binding scripts."""
+    await script_bind_req(fakeable_gateway, DEV_ID)  # type: ignore[arg-type]
+    mock_dev = fakeable_gateway.device_registry.get_device.return_value
+    mock_dev._initiate_binding_process.assert_awaited_once_with([Code._2309])
 
-    class MockFakeable:
-        pass
-
-    mock_gateway.device_registry.get_device.return_value.__class__ = MockFakeable
+    await script_bind_wait(fakeable_gateway, DEV_ID)  # type: ignore[arg-type]
+    mock_dev._wait_for_binding_request.assert_awaited_once_with([Code._2309], idx="00")
+    assert mock_dev._make_fake.call_count == 2
 
-    with patch("ramses_cli.discovery.Fakeable", MockFakeable):
-        await script_bind_req(mock_gateway, DEV_ID)  # type: ignore[arg-type]
-        mock_dev = mock_gateway.device_registry.get_device(DEV_ID)
-        mock_dev._initiate_binding_process.assert_awaited()
-
-        await script_bind_wait(mock_gateway, DEV_ID)  # type: ignore[arg-type]
-        mock_dev._wait_for_binding_request.assert_awaited()
 
-
-@pytest.mark.asyncio
-async def test_script_binding_fail(mock_gateway: MagicMock) -> None:
+async def test_script_binding_fail(
+    mock_gateway: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Test binding script failure when device is not Fakeable."""
+    monkeypatch.setattr("ramses_cli.discovery.Fakeable", NotFakeable)
 
-    class RealFakeable:
-        pass
-
-    # Patch Fakeable to be a class that our device definitely IS NOT an instance of
-    with (
-        patch("ramses_cli.discovery.Fakeable", RealFakeable),
-        pytest.raises((AssertionError, TypeError)),
-    ):
+    with pytest.raises((AssertionError, TypeError)):
         await script_bind_req(mock_gateway, DEV_ID)  # type: ignore[arg-type]
 
 
-@pytest.mark.asyncio
 async def test_script_poll_device(mock_gateway: MagicMock) -> None:
     """Test script_poll_device task creation."""
     # Must be async test to provide loop for create_task
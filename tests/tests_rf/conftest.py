@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 """Fixtures for testing."""
 
+import copy
 import logging
 import os
-from collections.abc import AsyncGenerator
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Generator, Iterable
 from dataclasses import fields
+from datetime import datetime as dt, timedelta as td
 from pathlib import Path
 from typing import Any, Final, NoReturn, TypeAlias, TypedDict, cast
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import serial as ser
@@ -16,7 +19,9 @@ from serial.tools.list_ports import comports
 from ramses_rf import Gateway
 from ramses_rf.devices import HgiGateway
 from ramses_rf.gateway import GatewayConfig
-from ramses_tx import exceptions as exc
+from ramses_rf.messages import Message
+from ramses_rf.state import MessageStore
+from ramses_tx import Packet, exceptions as exc
 from ramses_tx.address import HGI_DEVICE_ID
 from ramses_tx.config import EngineConfig
 from ramses_tx.transport.port import PortTransport
@@ -53,6 +58,30 @@ IN_GITHUB_ACTIONS = os.getenv("GITHUB_ACTIONS") == "true"
 
 _global_failed_ports: list[str] = []
 
+# (name, seconds after _NOW, frame) of the packets shared by the test modules
+_RAMSES_FRAMES: Final[tuple[tuple[str, int, str], ...]] = (
+    ("msg1", 0, "...  I --- 32:166025 --:------ 32:166025 1298 003 007FFF"),
+    ("msg2", 10, "...  I --- 32:166025 --:------ 32:166025 1298 003 001230"),
+    (
+        "msg3",
+        20,
+        "060  I --- 01:087939 --:------ 01:087939 2309 021 "
+        "0007D00106400201F40301F40401F40501F40601F4",
+    ),
+    (
+        "msg4",
+        30,
+        "060  I --- 32:166025 --:------ 32:166025 31DA 030 "
+        "00EF00019E00EF06E17FFF08020766BE09001F000000000000"
+        "8500850000",
+    ),
+    # heat_demand
+    ("msg5", 40, "...  I --- 04:189078 --:------ 01:145038 3150 002 0100"),
+    # OTB
+    ("msg6", 50, "061 RP --- 10:078099 01:087939 --:------ 3220 005 00C0110000"),
+    ("msg7", 60, "...  I --- 04:189078 --:------ 01:145038 12B0 003 040000"),
+)
+
 
 ###############################################################################
 
@@ -66,6 +95,8 @@ def patches_for_tests(monkeypatch: pytest.MonkeyPatch) -> None:
     )
     monkeypatch.setattr("ramses_tx.transport.port._DBG_DISABLE_DUTY_CYCLE_LIMIT", True)
     monkeypatch.setattr("ramses_tx.transport.port.MIN_INTER_WRITE_GAP", 0)
+    # the safe-mode traceback rate-limiter is process-wide, so isolate each test
+    monkeypatch.setattr("ramses_rf.dispatcher._traceback_last_seen", OrderedDict())
 
 
 # TODO: add teardown to cleanup orphan MessageStore thread
@@ -88,6 +119,87 @@ def patches_for_tests(monkeypatch: pytest.MonkeyPatch) -> None:
 ###############################################################################
 
 
+@pytest.fixture(scope="session")
+def gateway_template() -> MagicMock:
+    """Build the spec'd Gateway mock once per session.
+
+    MagicMock(spec=Gateway) introspects the Gateway class, so the mock_gateway
+    fixtures copy.deepcopy() this template per test instead. A shallow copy is
+    not enough, as it would share the child mocks (and their call state).
+    """
+    return MagicMock(spec=Gateway)
+
+
+@pytest.fixture()
+def mock_gateway(
+    gateway_template: MagicMock, message_store: MessageStore
+) -> Generator[MagicMock, None, None]:
+    """Create a mock Gateway instance for testing."""
+    gateway = copy.deepcopy(gateway_template)
+    gateway.send_cmd = AsyncMock()
+    gateway.dispatcher = MagicMock()
+
+    # Use the strictly typed GatewayConfig DTO instead of loose mock attributes
+    gateway.config = GatewayConfig(
+        disable_discovery=False,
+        enable_eavesdrop=False,
+        reduce_processing=0,
+    )
+
+    # Mock the internal engine and its loop to reflect the new architecture
+    gateway._engine = MagicMock()
+    gateway._engine._loop.time = MagicMock(return_value=0.0)
+    gateway._engine._include = {}
+
+    # Support legacy proxy access (dispatcher.py currently still uses `gwy._loop`)
+    gateway._loop = gateway._engine._loop
+
+    # Correctly mock the device registry structure
+    gateway.device_registry = MagicMock()
+    gateway.device_registry.device_by_id = {}
+
+    # activate the (shared) MessageStore
+    gateway.message_store = message_store
+
+    yield gateway
+
+
+def parse_frames(frames: Iterable[tuple[str, int, str]]) -> dict[str, Message]:
+    """Parse (name, seconds, frame) tuples into Messages, keyed by name.
+
+    Each Message is timestamped that many seconds after now (to the second).
+    """
+
+    now = dt.now().replace(microsecond=0)
+    return {
+        name: Message._from_pkt(Packet(now + td(seconds=secs), frame))
+        for name, secs, frame in frames
+    }
+
+
+@pytest.fixture(scope="session")
+def ramses_msgs() -> dict[str, Message]:
+    """Parse the shared packets into Messages, once per session."""
+    return parse_frames(_RAMSES_FRAMES)
+
+
+@pytest.fixture(scope="session")
+def _session_message_store() -> MessageStore:
+    """Build the one (synchronous, in-memory) MessageStore shared by the session."""
+    return MessageStore(maintain=False)
+
+
+@pytest.fixture()
+async def message_store(_session_message_store: MessageStore) -> MessageStore:
+    """Utilize the shared MessageStore, emptied of any earlier test's messages."""
+
+    await _session_message_store.clr()
+    return _session_message_store
+
+
+###############################################################################
+
+
 @pytest.fixture()
 async def rf() -> AsyncGenerator[VirtualRf, None]:
     """Utilize a virtual evofw3-compatible gateway."""
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Unittests for the HvacVentilator class."""
 
-from collections.abc import Generator
+import logging
+from dataclasses import dataclass
 from enum import Enum
-from typing import cast
+from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -11,10 +12,9 @@ import pytest
 from ramses_rf import exceptions as exc
 from ramses_rf.const import DevType
 from ramses_rf.devices import HvacVentilator
-from ramses_rf.gateway import Gateway
+from ramses_rf.messages import Message
 from ramses_rf.models.state_base import DeviceTraits
 from ramses_rf.models.state_hvac import HvacState
-from ramses_rf.state import MessageStore
 from ramses_tx import Address
 from ramses_tx.const import Code
 from ramses_tx.typing import DeviceIdT
@@ -28,31 +28,37 @@ TEST_BOUND_DEVICE_ID = "37:123456"
 TEST_BOUND_DEVICE_TYPE = DevType.REM
 
 
-@pytest.fixture
-def mock_gateway() -> Generator[MagicMock, None, None]:
-    """Create a mock Gateway instance for testing.
+@dataclass(frozen=True, slots=True)
+class _FakeAddr:
+    """A stand-in for an Address, with only the id the handlers read."""
+
+    id: str
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeMsg:
+    """A stand-in for a Message, with only the attributes the handlers read."""
+
+    code: Code
+    verb: str
+    payload: dict[str, Any] | None
+    src: _FakeAddr = _FakeAddr(TEST_DEVICE_ID)
+    dst: _FakeAddr = _FakeAddr(TEST_DEVICE_ID)
 
-    :return: A generator yielding the mock Gateway.
-    :rtype: Generator[MagicMock, None, None]
+
+def _fake_msg(code: Code, verb: str, payload: dict[str, Any] | None) -> Message:
+    """Build a lightweight 2411-style message to/from the test FAN.
+
+    :param code: The message code.
+    :type code: Code
+    :param verb: The message verb.
+    :type verb: str
+    :param payload: The (parsed) message payload.
+    :type payload: dict[str, Any] | None
+    :return: The fake message, typed as a Message for the handlers.
+    :rtype: Message
     """
-    gateway = MagicMock(spec=Gateway)
-    gateway.send_cmd = AsyncMock()
-    gateway.dispatcher = MagicMock()
-    gateway.dispatcher.send = MagicMock()
-
-    # Add required attributes
-    gateway.config = MagicMock()
-    gateway.config.disable_discovery = False
-    gateway.config.enable_eavesdrop = False
-    gateway._loop = MagicMock()
-    gateway._loop.call_soon = MagicMock()
-    gateway._loop.call_later = MagicMock()
-    gateway._loop.time = MagicMock(return_value=0.0)
-    gateway._include = {}
-    # Add msg_db attribute accessed by the message store
-    gateway.message_store = MessageStore(maintain=False)
-
-    yield gateway
+    return cast(Message, _FakeMsg(code, verb, payload))
 
 
 @pytest.fixture
@@ -71,20 +77,29 @@ def hvac_ventilator(mock_gateway: MagicMock) -> HvacVentilator:
 class TestHvacVentilator:
     """Test HvacVentilator class."""
 
-    def test_initialization(self, hvac_ventilator: HvacVentilator) -> None:
+    @pytest.mark.parametrize(
+        ("attr", "expected"),
+        [
+            ("_supports_2411", False),
+            ("_initialized_callback", None),
+            ("_param_update_callback", None),
+            ("_hgi", None),
+            ("_bound_devices", {}),
+        ],
+    )
+    def test_initialization(
+        self, hvac_ventilator: HvacVentilator, attr: str, expected: Any
+    ) -> None:
         """Test that the ventilator initializes correctly.
 
         :param hvac_ventilator: The HvacVentilator fixture.
         :type hvac_ventilator: HvacVentilator
+        :param attr: The name of the FAN-specific attribute to check.
+        :type attr: str
+        :param expected: The attribute's expected initial value.
+        :type expected: Any
         """
-        assert hvac_ventilator._supports_2411 is False
-        assert hvac_ventilator._initialized_callback is None
-        assert hvac_ventilator._param_update_callback is None
-        assert hvac_ventilator._hgi is None
-        assert hvac_ventilator._bound_devices == {}
-
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
+        assert getattr(hvac_ventilator, attr) == expected
 
     def test_set_initialized_callback_clear(
         self, hvac_ventilator: HvacVentilator
@@ -102,9 +117,6 @@ class TestHvacVentilator:
         hvac_ventilator.set_initialized_callback(None)
         assert hvac_ventilator._initialized_callback is None
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_set_initialized_callback_set(
         self, hvac_ventilator: HvacVentilator
     ) -> None:
@@ -116,9 +128,6 @@ class TestHvacVentilator:
         # Test initial state
         assert hvac_ventilator._initialized_callback is None
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
         # Set the callback
         mock_callback = MagicMock()
         hvac_ventilator.set_initialized_callback(mock_callback)
@@ -131,9 +140,6 @@ class TestHvacVentilator:
         :param hvac_ventilator: The HvacVentilator fixture.
         :type hvac_ventilator: HvacVentilator
         """
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
         # Define a mock callback
         mock_callback = MagicMock()
 
@@ -149,16 +155,9 @@ class TestHvacVentilator:
         :param hvac_ventilator: The HvacVentilator fixture.
         :type hvac_ventilator: HvacVentilator
         """
-        # Create a mock message with all required attributes
-        msg = MagicMock()
-        msg.code = Code._2411
-        # Create proper mock objects for src and dst with id attribute
-        msg.src = MagicMock()
-        msg.src.id = TEST_DEVICE_ID
-        msg.dst = MagicMock()
-        msg.dst.id = TEST_DEVICE_ID
-        msg.verb = " I"
-        msg.payload = {"parameter": TEST_PARAM_ID, "value": TEST_PARAM_VALUE}
+        msg = _fake_msg(
+            Code._2411, " I", {"parameter": TEST_PARAM_ID, "value": TEST_PARAM_VALUE}
+        )
 
         # Set up the message store
         hvac_ventilator._params_2411 = {}
@@ -180,10 +179,7 @@ class TestHvacVentilator:
         # Check that the callback was called with the correct parameters
         mock_callback.assert_called_once_with(TEST_PARAM_ID, TEST_PARAM_VALUE)
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
-    async def test_setup_discovery_cmds(self, hvac_ventilator: HvacVentilator) -> None:
+    def test_setup_discovery_cmds(self, hvac_ventilator: HvacVentilator) -> None:
         """Test that discovery commands are set up correctly.
 
         :param hvac_ventilator: The HvacVentilator fixture.
@@ -196,9 +192,6 @@ class TestHvacVentilator:
         assert "10D0" in schedule, "Filter change (10D0) not scheduled for FAN"
         assert "3150" in schedule, "Fan speed status (3150) not scheduled for FAN"
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_add_bound_device(
         self, hvac_ventilator: HvacVentilator, caplog: pytest.LogCaptureFixture
     ) -> None:
@@ -209,16 +202,6 @@ class TestHvacVentilator:
         :param caplog: The pytest log capture fixture.
         :type caplog: pytest.LogCaptureFixture
         """
-        # Ensure the logger is at the right level to capture the warning
-        import logging
-
-        logger = logging.getLogger("ramses_rf.devices")
-        logger.setLevel(logging.WARNING)
-
-        # Clear any existing log handlers to avoid duplicates
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-
         # Add a bound device
         hvac_ventilator.add_bound_device(TEST_BOUND_DEVICE_ID, TEST_BOUND_DEVICE_TYPE)
 
@@ -240,19 +223,13 @@ class TestHvacVentilator:
         # Check if any record contains the expected message
         expected_message = f"Cannot bind device {invalid_device_id} of type INVALID_TYPE to FAN {hvac_ventilator.id}: must be REM or DIS"
 
-        # Print debug info if the test fails
-        if not any(expected_message in record.message for record in caplog.records):
-            print("\nCaptured log records:")
-            for i, record in enumerate(caplog.records):
-                print(f"  {i}: {record.levelname}: {record.message}")
-
         # Check if the warning was logged
-        assert any(expected_message in record.message for record in caplog.records), (
-            f"Expected warning message not found in logs. Expected: {expected_message}"
+        matched = next(
+            (r for r in caplog.records if expected_message in r.message), None
+        )
+        assert matched is not None, (
+            f"Expected warning missing. Got: {[r.message for r in caplog.records]}"
         )
-
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
 
     def test_remove_bound_device(self, hvac_ventilator: HvacVentilator) -> None:
         """Test removing a bound device.
@@ -270,9 +247,6 @@ class TestHvacVentilator:
         # Removing non-existent device should not raise
         hvac_ventilator.remove_bound_device("nonexistent:device")
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_get_bound_rem(self, hvac_ventilator: HvacVentilator) -> None:
         """Test getting a bound REM device.
 
@@ -292,9 +266,6 @@ class TestHvacVentilator:
         hvac_ventilator.add_bound_device("38:123456", DevType.DIS)
         assert hvac_ventilator.get_bound_rem() == TEST_BOUND_DEVICE_ID
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_get_fan_param_supported(self, hvac_ventilator: HvacVentilator) -> None:
         """Test getting a supported fan parameter.
 
@@ -311,9 +282,6 @@ class TestHvacVentilator:
         value = hvac_ventilator.get_fan_param(TEST_PARAM_ID)
         assert value == TEST_PARAM_VALUE
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_get_fan_param_unsupported(
         self, hvac_ventilator: HvacVentilator, caplog: pytest.LogCaptureFixture
     ) -> None:
@@ -332,9 +300,6 @@ class TestHvacVentilator:
         value = hvac_ventilator.get_fan_param(TEST_PARAM_ID)
         assert value is None
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_get_fan_param_normalization(self, hvac_ventilator: HvacVentilator) -> None:
         """Test parameter ID normalization.
 
@@ -351,9 +316,6 @@ class TestHvacVentilator:
         assert hvac_ventilator.get_fan_param("3F") == 75
         assert hvac_ventilator.get_fan_param("0003F") == 75
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_initialized_callback(self, hvac_ventilator: HvacVentilator) -> None:
         """Test the initialized callback behaviour.
 
@@ -381,9 +343,6 @@ class TestHvacVentilator:
         hvac_ventilator._handle_initialized_callback()
         mock_callback.assert_called_once()  # Still only called once
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_hgi_property(
         self, hvac_ventilator: HvacVentilator, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -417,8 +376,6 @@ class TestHvacVentilator:
 
         # Clear the cache
         hvac_ventilator._hgi = None
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
 
         # Now it should get the new value
         assert hvac_ventilator.hgi is new_hgi
@@ -431,13 +388,7 @@ class TestHvacVentilator:
         :type hvac_ventilator: HvacVentilator
         """
         # Create an invalid message (missing payload)
-        msg = MagicMock()
-        msg.verb = " I"
-        msg.src = MagicMock()
-        msg.src.id = TEST_DEVICE_ID
-        msg.dst = MagicMock()
-        msg.dst.id = TEST_DEVICE_ID
-        msg.payload = None  # Invalid payload
+        msg = _fake_msg(Code._2411, " I", None)
 
         # Set up a callback to verify it's not called
         mock_callback = MagicMock()
@@ -449,9 +400,6 @@ class TestHvacVentilator:
         # No parameter update callback should be called
         mock_callback.assert_not_called()
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_missing_callback(self, hvac_ventilator: HvacVentilator) -> None:
         """Test behaviour when callbacks are not set.
 
@@ -462,14 +410,7 @@ class TestHvacVentilator:
         hvac_ventilator._handle_param_update("3F", 50)
 
         # And with a message that would trigger callbacks
-        msg = MagicMock()
-        msg.code = Code._2411
-        msg.verb = " I"
-        msg.src = MagicMock()
-        msg.src.id = TEST_DEVICE_ID
-        msg.dst = MagicMock()
-        msg.dst.id = TEST_DEVICE_ID
-        msg.payload = {"parameter": "3F", "value": 50}
+        msg = _fake_msg(Code._2411, " I", {"parameter": "3F", "value": 50})
 
         # This should not raise an exception
         hvac_ventilator._handle_2411_message(msg)
@@ -484,32 +425,26 @@ class TestHvacVentilator:
         # Callback should be called with the parameter and value
         mock_callback.assert_called_once_with("3F", 50)
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()  # close sqlite3 connection
-
     def test_2411_param_01_data_type_20(self, hvac_ventilator: HvacVentilator) -> None:
         """Test parsing of 2411 parameter 01 with data type 20 (GitHub issue #342).
 
         :param hvac_ventilator: The HvacVentilator fixture.
         :type hvac_ventilator: HvacVentilator
         """
-        msg = MagicMock()
-        msg.code = Code._2411
-        msg.verb = "RP"
-        msg.src = MagicMock()
-        msg.src.id = TEST_DEVICE_ID
-        msg.dst = MagicMock()
-        msg.dst.id = TEST_DEVICE_ID
-        msg.payload = {
-            "parameter": "01",
-            "description": "Support",
-            "value": 3307,
-            "_value_06": "0020",
-            "min_value": 0,
-            "max_value": 65535,
-            "precision": 1,
-            "_value_42": "B500",
-        }
+        msg = _fake_msg(
+            Code._2411,
+            "RP",
+            {
+                "parameter": "01",
+                "description": "Support",
+                "value": 3307,
+                "_value_06": "0020",
+                "min_value": 0,
+                "max_value": 65535,
+                "precision": 1,
+                "_value_42": "B500",
+            },
+        )
 
         hvac_ventilator._handle_2411_message(msg)
 
@@ -517,32 +452,26 @@ class TestHvacVentilator:
         stored_value = hvac_ventilator.get_fan_param("1")
         assert stored_value == 3307
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()
-
     def test_2411_param_3e_data_type_90(self, hvac_ventilator: HvacVentilator) -> None:
         """Test parsing of 2411 parameter 3E with data type 90 (GitHub issue #317).
 
         :param hvac_ventilator: The HvacVentilator fixture.
         :type hvac_ventilator: HvacVentilator
         """
-        msg = MagicMock()
-        msg.code = Code._2411
-        msg.verb = "RP"
-        msg.src = MagicMock()
-        msg.src.id = TEST_DEVICE_ID
-        msg.dst = MagicMock()
-        msg.dst.id = TEST_DEVICE_ID
-        msg.payload = {
-            "parameter": "3E",
-            "description": "Away mode Exhaust fan rate (%)",
-            "value": 800,
-            "_value_06": "7690",
-            "min_value": 0,
-            "max_value": 2000,
-            "precision": 1,
-            "_value_42": "8A33",
-        }
+        msg = _fake_msg(
+            Code._2411,
+            "RP",
+            {
+                "parameter": "3E",
+                "description": "Away mode Exhaust fan rate (%)",
+                "value": 800,
+                "_value_06": "7690",
+                "min_value": 0,
+                "max_value": 2000,
+                "precision": 1,
+                "_value_42": "8A33",
+            },
+        )
 
         hvac_ventilator._handle_2411_message(msg)
 
@@ -550,9 +479,6 @@ class TestHvacVentilator:
         stored_value = hvac_ventilator.get_fan_param("3E")
         assert stored_value == 800
 
-        if hvac_ventilator._gwy.message_store:
-            hvac_ventilator._gwy.message_store.stop()
-
 
 async def test_set_fan_mode_with_bound_rem() -> None:
     """Test set_fan_mode uses the bound REM as the source ID."""
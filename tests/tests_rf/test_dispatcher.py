@@ -2,7 +2,6 @@
 """RAMSES RF - Unittests for dispatcher."""
 
 import logging
-from collections.abc import Generator
 from datetime import datetime as dt, timedelta as td
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,49 +16,13 @@ from ramses_rf.const import (
     Code,
     DevType,
 )
-from ramses_rf.gateway import Gateway, GatewayConfig
+from ramses_rf.gateway import GatewayConfig
 from ramses_rf.messages import Message
 from ramses_rf.models import HvacState
-from ramses_rf.state import MessageStore
 from ramses_tx import Address, DeviceIdT, Packet
 from ramses_tx.config import EngineConfig
 
 
-@pytest.fixture
-def mock_gateway() -> Generator[MagicMock, None, None]:
-    """Create a mock Gateway instance for testing."""
-    gateway = MagicMock(spec=Gateway)
-    gateway.send_cmd = AsyncMock()
-
-    # Use the strictly typed GatewayConfig DTO instead of loose mock attributes
-    gateway.config = GatewayConfig(
-        disable_discovery=False,
-        enable_eavesdrop=False,
-        reduce_processing=0,
-    )
-
-    # Mock the internal engine and its loop to reflect the new architecture
-    gateway._engine = MagicMock()
-    gateway._engine._loop = MagicMock()
-    gateway._engine._loop.call_soon = MagicMock()
-    gateway._engine._loop.call_later = MagicMock()
-    gateway._engine._loop.time = MagicMock(return_value=0.0)
-
-    # Support legacy proxy access (dispatcher.py currently still uses `gwy._loop`)
-    gateway._loop = gateway._engine._loop
-
-    # Correctly mock the device registry structure
-    gateway.device_registry = MagicMock()
-    gateway.device_registry.device_by_id = {}
-
-    gateway._engine._include = {}
-
-    # activate the SQLite MessageStore
-    gateway.message_store = MessageStore(maintain=False)
-
-    yield gateway
-
-
 class Test_dispatcher_gateway:
     """Test Dispatcher class."""
 
@@ -68,41 +31,29 @@ class Test_dispatcher_gateway:
     _NONA = "--:------"
     _NOW = dt.now().replace(microsecond=0)
 
-    msg5: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=40),
-            # heat_demand
-            "...  I --- 04:189078 --:------ 01:145038 3150 002 0100",
-        )
-    )
-
-    msg6: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=50),
-            # OTB
-            "061 RP --- 10:078099 01:087939 --:------ 3220 005 00C0110000",
-        )
-    )
-
     @pytest.mark.skip(reason="requires gwy")
-    def test_instantiate_devices(self, mock_gateway: MagicMock) -> None:
+    def test_instantiate_devices(
+        self, mock_gateway: MagicMock, ramses_msgs: dict[str, Message]
+    ) -> None:
         """Test device creation from addresses via pipeline stage."""
         dev1 = Device(mock_gateway, Address(DeviceIdT("04:189078")))
         mock_gateway.device_registry.device_by_id.get = MagicMock(return_value=dev1)
         mock_gateway._check_dst_slug = MagicMock(return_value="CTL")
 
-        dispatcher.instantiate_devices(mock_gateway, self.msg5)
-
-        mock_gateway.message_store.stop()  # close sqlite3 connection
+        dispatcher.instantiate_devices(mock_gateway, ramses_msgs["msg5"])
 
-    def test_validate_addresses(self, mock_gateway: MagicMock) -> None:
+    def test_validate_addresses(
+        self, mock_gateway: MagicMock, ramses_msgs: dict[str, Message]
+    ) -> None:
         """Test address validation via pipeline stage."""
-        dispatcher.validate_addresses(mock_gateway, self.msg5)
-        dispatcher.validate_addresses(mock_gateway, self.msg6)
+        dispatcher.validate_addresses(mock_gateway, ramses_msgs["msg5"])
+        dispatcher.validate_addresses(mock_gateway, ramses_msgs["msg6"])
 
-    def test_validate_slugs(self, mock_gateway: MagicMock) -> None:
+    def test_validate_slugs(
+        self, mock_gateway: MagicMock, ramses_msgs: dict[str, Message]
+    ) -> None:
         """Test destination slug validation via pipeline stage."""
-        dispatcher.validate_slugs(mock_gateway, self.msg5)
+        dispatcher.validate_slugs(mock_gateway, ramses_msgs["msg5"])
 
     def test_detect_array_fragment(self) -> None:
         """Test detection of array fragments."""
@@ -188,7 +139,50 @@ class TestDispatcherErrorHandling:
         # Check that it was logged as a WARNING
         assert any(r.levelname == "WARNING" for r in caplog.records)
         # Check that traceback information is present (exc_info=True)
-        assert any(r.exc_info is not None for r in caplog.records)
+        assert any(r.exc_info for r in caplog.records)
+
+    async def test_process_msg_safe_mode_traceback_rate_limited(
+        self,
+        mock_gateway: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test a repeated error is still logged, but without a 2nd traceback."""
+        mock_gateway.config.enforce_strict_handling = False
+
+        msg = Message._from_pkt(
+            Packet(
+                dt.now(),
+                "...  I --- 01:000001 --:------ 01:000001 0001 005 00FFFF0200",
+            )
+        )
+
+        with (
+            patch(
+                "ramses_rf.dispatcher.validate_addresses",
+                side_effect=ValueError("Repeated Error"),
+            ),
+            caplog.at_level(logging.WARNING),
+        ):
+            await dispatcher.process_msg(mock_gateway, msg)
+            await dispatcher.process_msg(mock_gateway, msg)
+
+        records = [r for r in caplog.records if "Repeated Error" in r.getMessage()]
+        assert [r.levelname for r in records] == ["WARNING", "WARNING"]
+        assert records[0].exc_info
+        assert not records[1].exc_info
+
+    def test_traceback_rate_limiter_evicts_oldest(self) -> None:
+        """Test the signature table evicts its stalest entry, not all of them."""
+        msg = MagicMock(code=Code._0001)
+        max_sigs = dispatcher._TRACEBACK_MAX_SIGS
+
+        for i in range(max_sigs + 1):
+            assert dispatcher._want_traceback(ValueError(f"err {i}"), msg)
+
+        assert len(dispatcher._traceback_last_seen) == max_sigs
+        # the 1st signature was evicted, the 2nd (& later) are still suppressed
+        assert dispatcher._want_traceback(ValueError("err 0"), msg)
+        assert not dispatcher._want_traceback(ValueError("err 2"), msg)
 
 
 class TestDispatcherHeartbeats:
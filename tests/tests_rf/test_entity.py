@@ -1,47 +1,44 @@
 #!/usr/bin/env python3
 """RAMSES RF - Unittests for entity_base."""
 
-from collections.abc import Generator
-from datetime import datetime as dt, timedelta as td
-from unittest.mock import AsyncMock, MagicMock
+from dataclasses import dataclass
+from typing import Any, Final, cast
+from unittest.mock import MagicMock
 
 import pytest
 
 from ramses_rf.const import I_, RP
 from ramses_rf.entity import _Entity
-from ramses_rf.gateway import Gateway
 from ramses_rf.messages import Message
 from ramses_rf.routing import StateHeader
-from ramses_rf.state import MessageStore
-from ramses_tx import Code, DeviceIdT, Packet
+from ramses_tx import Code, DeviceIdT
 
+from .conftest import parse_frames
 
-@pytest.fixture
-def mock_gateway() -> Generator[MagicMock, None, None]:
-    """Create a mock Gateway instance for testing."""
-    gateway = MagicMock(spec=Gateway)
-    gateway.send_cmd = AsyncMock()
-    gateway.dispatcher = MagicMock()
-    gateway.dispatcher.send = MagicMock()
 
-    # Add required attributes
-    gateway.config = MagicMock()
-    gateway.config.disable_discovery = True
-    gateway.config.enable_eavesdrop = False
+@dataclass(frozen=True, slots=True)
+class _FakeMsg:
+    """A stand-in for a Message, with only the attributes _msg_value_msg reads."""
 
-    # Explicitly attach the nested engine mock to bypass the spec restriction
-    gateway._engine = MagicMock()
-    gateway._engine._include = {}
+    payload: Any
+    code: Code
+    _expired: bool = False
 
-    gateway._loop = MagicMock()
-    gateway._loop.call_soon = MagicMock()
-    gateway._loop.call_later = MagicMock()
-    gateway._loop.time = MagicMock(return_value=0.0)
 
-    # activate the SQLite MessageStore
-    gateway.message_store = MessageStore(maintain=False)
+# named for their content, so as not to be confused with the msgN of ramses_msgs
+_ENTITY_FRAMES: Final[tuple[tuple[str, int, str], ...]] = (
+    ("heat_demand", 40, "...  I --- 04:189078 --:------ 01:145038 3150 002 0100"),
+    ("otb_rp", 50, "061 RP --- 01:145038 04:189078 --:------ 3220 005 00C0110000"),
+    ("window_open", 60, "...  I --- 04:189078 --:------ 01:145038 12B0 003 010000"),
+    ("ctl_heat_demand", 70, "045  I --- 01:145038 --:------ 01:145038 3150 002 FC90"),
+    ("dhw_temp", 80, "045 RP --- 01:145038 18:006402 --:------ 1260 003 00182B"),
+)
 
-    yield gateway
+
+@pytest.fixture(scope="module")
+def entity_msgs() -> dict[str, Message]:
+    """Parse the Messages used by the _Entity tests, once per module."""
+    return parse_frames(_ENTITY_FRAMES)
 
 
 class Test_entity_base:
@@ -50,30 +47,10 @@ class Test_entity_base:
     _SRC1 = "32:166025"
     _SRC2 = "01:087939"  # (CTR)
     _NONA = "--:------"
-    _NOW = dt.now().replace(microsecond=0)
-
-    msg5: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=40),
-            "...  I --- 04:189078 --:------ 01:145038 3150 002 0100",  # heat_demand
-        )
-    )
-
-    msg6: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=50),
-            "061 RP --- 01:145038 04:189078 --:------ 3220 005 00C0110000",  # OTB
-        )
-    )
-
-    msg7: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=60),
-            "...  I --- 04:189078 --:------ 01:145038 12B0 003 010000",  # window_open
-        )
-    )
 
-    async def test_entity_base_dev(self, mock_gateway: MagicMock) -> None:
+    async def test_entity_base_dev(
+        self, mock_gateway: MagicMock, entity_msgs: dict[str, Message]
+    ) -> None:
         """Test the base entity behavior for a device."""
         dev = _Entity(mock_gateway)
         dev.id = DeviceIdT("04:189078")
@@ -81,9 +58,9 @@ class Test_entity_base:
 
         # put messages in the message_store (bypass proxy)
         assert dev._gwy.message_store is not None
-        dev._gwy.message_store.add(self.msg5)
-        dev._gwy.message_store.add(self.msg6)
-        dev._gwy.message_store.add(self.msg7)
+        dev._gwy.message_store.add(entity_msgs["heat_demand"])
+        dev._gwy.message_store.add(entity_msgs["otb_rp"])
+        dev._gwy.message_store.add(entity_msgs["window_open"])
         assert len(await dev._gwy.message_store.all()) == 3, "len(msg_db.all) wrong"
 
         # start tests
@@ -91,9 +68,9 @@ class Test_entity_base:
 
         # create _msgs using internal Enums instead of strings
         assert await dev.entity_state.get_message_log_flat() == {
-            Code._12B0: self.msg7,
-            Code._3150: self.msg5,
-            Code._3220: self.msg6,
+            Code._12B0: entity_msgs["window_open"],
+            Code._3150: entity_msgs["heat_demand"],
+            Code._3220: entity_msgs["otb_rp"],
         }, "base message_log_flat wrong"
 
         # find our Codes
@@ -108,9 +85,9 @@ class Test_entity_base:
         # list our messages
         assert sorted(await dev.entity_state.get_all_messages()) == sorted(
             [
-                self.msg5,
-                self.msg7,
-                self.msg6,
+                entity_msgs["heat_demand"],
+                entity_msgs["window_open"],
+                entity_msgs["otb_rp"],
             ]
         ), "_msg_list wrong"
 
@@ -118,21 +95,21 @@ class Test_entity_base:
         cache = await dev.entity_state._build_state_cache()
         assert (
             cache.get_message(StateHeader.create(Code._12B0, I_, "04:189078", "01"))
-            == self.msg7
+            == entity_msgs["window_open"]
         )
         assert (
             cache.get_message(StateHeader.create(Code._3150, I_, "04:189078", "01"))
-            == self.msg5
+            == entity_msgs["heat_demand"]
         )
         assert (
             cache.get_message(StateHeader.create(Code._3220, RP, "01:145038", "11"))
-            == self.msg6
+            == entity_msgs["otb_rp"]
         )
         assert len(cache.get_all()) == 3, "base state_cache wrong"
 
-        mock_gateway.message_store.stop()  # close sqlite3 connection
-
-    async def test_entity_base_zone(self, mock_gateway: MagicMock) -> None:
+    async def test_entity_base_zone(
+        self, mock_gateway: MagicMock, entity_msgs: dict[str, Message]
+    ) -> None:
         """Test the base entity behavior for a zone."""
         dev = _Entity(mock_gateway)
         dev.id = DeviceIdT("04:189078_01")
@@ -140,17 +117,17 @@ class Test_entity_base:
 
         # put messages in the message_store (bypass proxy)
         assert dev._gwy.message_store is not None
-        dev._gwy.message_store.add(self.msg5)
-        dev._gwy.message_store.add(self.msg6)
-        dev._gwy.message_store.add(self.msg7)
+        dev._gwy.message_store.add(entity_msgs["heat_demand"])
+        dev._gwy.message_store.add(entity_msgs["otb_rp"])
+        dev._gwy.message_store.add(entity_msgs["window_open"])
 
         # start tests
         assert dev.id == "04:189078_01"
 
         # create _msgs
         assert await dev.entity_state.get_message_log_flat() == {
-            Code._12B0: self.msg7,
-            Code._3150: self.msg5,
+            Code._12B0: entity_msgs["window_open"],
+            Code._3150: entity_msgs["heat_demand"],
         }, "zone message_log_flat wrong"
 
         # find our Codes
@@ -164,8 +141,8 @@ class Test_entity_base:
         # list our messages
         assert sorted(await dev.entity_state.get_all_messages()) == sorted(
             [
-                self.msg5,
-                self.msg7,
+                entity_msgs["heat_demand"],
+                entity_msgs["window_open"],
             ]
         ), "_msg_list wrong"
 
@@ -173,31 +150,17 @@ class Test_entity_base:
         cache = await dev.entity_state._build_state_cache()
         assert (
             cache.get_message(StateHeader.create(Code._12B0, I_, "04:189078", "01"))
-            == self.msg7
+            == entity_msgs["window_open"]
         )
         assert (
             cache.get_message(StateHeader.create(Code._3150, I_, "04:189078", "01"))
-            == self.msg5
+            == entity_msgs["heat_demand"]
         )
         assert len(cache.get_all()) == 2, "zone state_cache wrong"
 
-        mock_gateway.message_store.stop()  # close sqlite3 connection
-
-    msg8: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=70),
-            "045  I --- 01:145038 --:------ 01:145038 3150 002 FC90",  # heat_demand
-        )
-    )
-
-    msg9: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=80),
-            "045 RP --- 01:145038 18:006402 --:------ 1260 003 00182B",  # setpoint
-        )
-    )
-
-    async def test_entity_base_dhw(self, mock_gateway: MagicMock) -> None:
+    async def test_entity_base_dhw(
+        self, mock_gateway: MagicMock, entity_msgs: dict[str, Message]
+    ) -> None:
         """Test the base entity behavior for DHW."""
         dev = _Entity(mock_gateway)
         dev.id = DeviceIdT("01:145038_HW")
@@ -205,19 +168,20 @@ class Test_entity_base:
 
         # put messages in the message_store (bypass proxy)
         assert dev._gwy.message_store is not None
-        dev._gwy.message_store.add(self.msg8)
-        dev._gwy.message_store.add(self.msg9)
+        dev._gwy.message_store.add(entity_msgs["ctl_heat_demand"])
+        dev._gwy.message_store.add(entity_msgs["dhw_temp"])
 
         # start tests
         assert dev.id == "01:145038_HW"
-        assert await dev._gwy.message_store.all() == (self.msg8, self.msg9), (
-            "wrong dhw all"
-        )
+        assert await dev._gwy.message_store.all() == (
+            entity_msgs["ctl_heat_demand"],
+            entity_msgs["dhw_temp"],
+        ), "wrong dhw all"
 
         # create _msgs
         assert await dev.entity_state.get_message_log_flat() == {
-            Code._1260: self.msg9,
-            Code._3150: self.msg8,
+            Code._1260: entity_msgs["dhw_temp"],
+            Code._3150: entity_msgs["ctl_heat_demand"],
         }, "dhw message_log_flat wrong"
 
         # find our Codes
@@ -231,8 +195,8 @@ class Test_entity_base:
         # list our messages
         assert sorted(await dev.entity_state.get_all_messages()) == sorted(
             [
-                self.msg8,
-                self.msg9,
+                entity_msgs["ctl_heat_demand"],
+                entity_msgs["dhw_temp"],
             ]
         ), "dhw _msg_list wrong"
 
@@ -240,26 +204,21 @@ class Test_entity_base:
         cache = await dev.entity_state._build_state_cache()
         assert (
             cache.get_message(StateHeader.create(Code._1260, RP, "01:145038", "00"))
-            == self.msg9
+            == entity_msgs["dhw_temp"]
         )
         assert (
             cache.get_message(StateHeader.create(Code._3150, I_, "01:145038", "FC"))
-            == self.msg8
+            == entity_msgs["ctl_heat_demand"]
         )
         assert len(cache.get_all()) == 2, "dhw state_cache wrong"
 
-        mock_gateway.message_store.stop()  # close sqlite3 connection
-
     def test_msg_value_msg_hardening(self, mock_gateway: MagicMock) -> None:
         """Test hardening fixes in _msg_value_msg (empty lists, full list return)."""
         dev = _Entity(mock_gateway)
         dev.id = DeviceIdT("01:123456")
 
         # Case 1: Empty payload list (should not crash with IndexError)
-        msg_empty = MagicMock(spec=Message)
-        msg_empty.payload = []
-        msg_empty._expired = False
-        msg_empty.code = Code._000A
+        msg_empty = cast(Message, _FakeMsg(payload=[], code=Code._000A))
 
         assert dev.entity_state._msg_value_msg(msg_empty) is None
 
@@ -268,10 +227,7 @@ class Test_entity_base:
             {"zone_idx": "00", "val": 10},
             {"zone_idx": "01", "val": 20},
         ]
-        msg_list = MagicMock(spec=Message)
-        msg_list.payload = payload_list
-        msg_list._expired = False
-        msg_list.code = Code._000A
+        msg_list = cast(Message, _FakeMsg(payload=payload_list, code=Code._000A))
 
         # key='*' -> return full list
         val = dev.entity_state._msg_value_msg(msg_list, key="*")
@@ -1,7 +1,7 @@
 """Unit tests for MessageStore and entity state management in ramses_rf.state."""
 
 import asyncio
-from datetime import datetime as dt, timedelta as td
+from datetime import datetime as dt
 from typing import Any, cast
 from unittest.mock import MagicMock
 
@@ -10,7 +10,7 @@ import pytest
 from ramses_rf.messages import Message
 from ramses_rf.routing import RoutingContext, StateHeader
 from ramses_rf.state import EntityState, MessageStore
-from ramses_tx import Code, Packet
+from ramses_tx import Code
 from ramses_tx.const import I_
 
 
@@ -79,8 +79,7 @@ def test_message_store_state_cache_indexing() -> None:
     assert store.state_cache[hdr] == mock_msg
 
 
-@pytest.mark.asyncio
-async def test_o1_push_model_ingest(zone_entity: EntityState) -> None:
+def test_o1_push_model_ingest(zone_entity: EntityState) -> None:
     """Verify the O(1) push model correctly caches on ingest."""
     msg = DummyMsg(
         "04:123456",
@@ -156,78 +155,31 @@ class TestMessageStore:
     _SRC1 = "32:166025"
     _SRC2 = "01:087939"
     _NONA = "--:------"
-    _NOW = dt.now().replace(microsecond=0)
-
-    msg1: Message = Message._from_pkt(
-        Packet(
-            _NOW,
-            "...  I --- 32:166025 --:------ 32:166025 1298 003 007FFF",
-        )
-    )
-    msg2: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=10),
-            "...  I --- 32:166025 --:------ 32:166025 1298 003 001230",
-        )
-    )
-    msg3: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=20),
-            "060  I --- 01:087939 --:------ 01:087939 2309 021 "
-            "0007D00106400201F40301F40401F40501F40601F4",
-        )
-    )
-    msg4: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=30),
-            "060  I --- 32:166025 --:------ 32:166025 31DA 030 "
-            "00EF00019E00EF06E17FFF08020766BE09001F000000000000"
-            "8500850000",
-        )
-    )
-    msg5: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=40),
-            "...  I --- 04:189078 --:------ 01:145038 3150 002 0100",
-        )
-    )
-    msg6: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=50),
-            "061 RP --- 10:078099 01:087939 --:------ 3220 005 00C0110000",
-        )
-    )
-    msg7: Message = Message._from_pkt(
-        Packet(
-            _NOW + td(seconds=60),
-            "...  I --- 04:189078 --:------ 01:145038 12B0 003 040000",
-        )
-    )
 
-    async def test_add_msg(self) -> None:
+    async def test_add_msg(self, ramses_msgs: dict[str, Message]) -> None:
         """Add a message to the MessageStore."""
         msg_db = MessageStore(disk_path=None)
 
-        assert self.msg1.payload == {"co2_level": None}
+        assert ramses_msgs["msg1"].payload == {"co2_level": None}
 
-        ret = msg_db.add(self.msg1)
+        ret = msg_db.add(ramses_msgs["msg1"])
         assert ret is None
         assert await msg_db.contains(code="1298")
         assert len(await msg_db.all()) == 1
 
-        ret = msg_db.add(self.msg2)
+        ret = msg_db.add(ramses_msgs["msg2"])
         assert ret is None
         assert len(await msg_db.all()) == 2
 
-        ret = msg_db.add(self.msg3)
+        ret = msg_db.add(ramses_msgs["msg3"])
         assert ret is None
         assert len(await msg_db.all()) == 3
 
-        ret = msg_db.add(self.msg5)
+        ret = msg_db.add(ramses_msgs["msg5"])
         assert ret is None
         assert len(await msg_db.all()) == 4
 
-        ret = msg_db.add(self.msg5)
+        ret = msg_db.add(ramses_msgs["msg5"])
         assert ret is None
         assert len(await msg_db.all()) == 4
 
@@ -235,15 +187,15 @@ class TestMessageStore:
         assert len(await msg_db.all()) == 0
         msg_db.stop()
 
-    async def test_qry_msg(self) -> None:
+    async def test_qry_msg(self, ramses_msgs: dict[str, Message]) -> None:
         """Query the MessageStore."""
         msg_db = MessageStore(disk_path=None)
-        msg_db.add(self.msg1)
-        msg_db.add(self.msg2)
-        msg_db.add(self.msg3)
-        msg_db.add(self.msg4)
-        msg_db.add(self.msg5)
-        msg_db.add(self.msg6)
+        msg_db.add(ramses_msgs["msg1"])
+        msg_db.add(ramses_msgs["msg2"])
+        msg_db.add(ramses_msgs["msg3"])
+        msg_db.add(ramses_msgs["msg4"])
+        msg_db.add(ramses_msgs["msg5"])
+        msg_db.add(ramses_msgs["msg6"])
 
         assert await msg_db.contains(code="2309")
         assert await msg_db.contains(code="3150")
@@ -273,24 +225,24 @@ class TestMessageStore:
 
         assert len(await msg_db.all()) == 6
 
-        msg_db.add(self.msg7)
+        msg_db.add(ramses_msgs["msg7"])
         res = await msg_db.get(src="04:189078")
         assert len(res) == 2
 
         msg_db.stop()
 
-    async def test_rem_msg(self) -> None:
+    async def test_rem_msg(self, ramses_msgs: dict[str, Message]) -> None:
         """Remove a message from the MessageStore."""
         msg_db = MessageStore(disk_path=None)
-        msg_db.add(self.msg1)
-        msg_db.add(self.msg2)
-        msg_db.add(self.msg3)
+        msg_db.add(ramses_msgs["msg1"])
+        msg_db.add(ramses_msgs["msg2"])
+        msg_db.add(ramses_msgs["msg3"])
 
         assert len(await msg_db.all()) == 3
 
-        await msg_db.rem(msg=self.msg1)
+        await msg_db.rem(msg=ramses_msgs["msg1"])
         assert len(await msg_db.all()) == 2
-        assert not await msg_db.contains(dtm=self.msg1.dtm)
+        assert not await msg_db.contains(dtm=ramses_msgs["msg1"].dtm)
 
         await msg_db.rem(code="2309")
         assert len(await msg_db.all()) == 1
@@ -298,13 +250,15 @@ class TestMessageStore:
 
         msg_db.stop()
 
-    async def test_fat_database_payload_serialization(self) -> None:
+    async def test_fat_database_payload_serialization(
+        self, ramses_msgs: dict[str, Message]
+    ) -> None:
         """Verify large payloads decode properly from the RAM cache."""
         msg_db = MessageStore(maintain=False, disk_path=None)
-        msg_db.add(self.msg4)
+        msg_db.add(ramses_msgs["msg4"])
 
         res = await msg_db.get(code="31DA")
         assert len(res) == 1
-        assert res[0].payload == self.msg4.payload
+        assert res[0].payload == ramses_msgs["msg4"].payload
 
         msg_db.stop()
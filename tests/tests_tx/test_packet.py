@@ -44,6 +44,18 @@ def test_packet_properties() -> None:
     assert packet.code == "1F09"
 
 
+def test_packet_verb_and_code_are_interned() -> None:
+    """Test that packets parsed from raw lines share their verb/code strings.
+
+    :return: None
+    """
+    pkt1 = Packet(DTM, VALID_FRAME_I)
+    pkt2 = Packet(DTM + td(seconds=1), VALID_FRAME_I)
+
+    assert pkt1.verb is pkt2.verb
+    assert pkt1.code is pkt2.code
+
+
 def test_packet_partitioning() -> None:
     """Test the static _partition method for log line splitting.
 
@@ -6,6 +6,7 @@ from typing import Any
 
 class Context:
     obj: Any
+    def get_usage(self) -> str: ...
 
 class ParamType:
     name: str
@@ -27,8 +28,13 @@ class File:
 class Path:
     def __init__(self, **kwargs: Any) -> None: ...
 
-class NoSuchOption(Exception): ...
-class BadParameter(Exception): ...
+class UsageError(Exception):
+    exit_code: int
+    ctx: Context | None
+    def format_message(self) -> str: ...
+
+class NoSuchOption(UsageError): ...
+class BadParameter(UsageError): ...
 
 STRING: Any
 